@@ -0,0 +1,248 @@
+# file: batch.py
+#
+# пакетний режим: багато пар (X, Y) за один запуск.
+#   python batch.py <тека або manifest.csv> [--method direct] [--out results/batch]
+#                   [--workers N] [--plots] [--cache-dir cache]
+#                   [--precision float32] [--tile 4096]
+#
+# тека: xN.bmp поєднується з yN.bmp (той самий суфікс N); файл без пари — помилка.
+# manifest.csv: стовпці x,y (шляхи відносно файлу маніфесту).
+#
+# пари групуються за X: псевдообернена (або G⁺ для прямого МНК) рахується
+# один раз на кожне різне X, групи обробляються паралельно в пулі процесів.
+# кожен процес пулу тримає один кеш у пам'яті для всіх своїх груп
+# (те саме X під іншим шляхом не перераховується), з --cache-dir спільна
+# частина ще й зберігається на диск і між запусками не перераховується
+# (див. pinv_cache.py).
+# matplotlib імпортується лише з --plots.
+
+import argparse
+import csv
+import glob
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from image_io import read_grayscale_image, save_grayscale_image, as_unit_float
+from pinv_cache import PseudoInverseCache
+from pseudoinverse import (
+    pseudo_inverse_moore_penrose_spectral,
+    pseudo_inverse_greville,
+    pseudo_inverse_randomized_svd,
+)
+from main import (
+    read_and_resize,
+    augment_with_ones,
+    augmented_gram,
+    augmented_cross,
+    solve_operator,
+    apply_operator,
+    compute_errors,
+)
+
+
+def augmented_gram_pinv(X: np.ndarray, tile=None, dtype=None):
+    """
+    G⁺ для G = X̃ X̃ᵀ у форматі (результат, iterations), як у методів псевдообернення
+    """
+    G = augmented_gram(X, tile, dtype)
+    return solve_operator(G, np.eye(G.shape[0], dtype=G.dtype)), 0
+
+
+METHODS = {
+    "moore_penrose": pseudo_inverse_moore_penrose_spectral,
+    "greville": pseudo_inverse_greville,
+    "randomized_svd": pseudo_inverse_randomized_svd,
+    "direct": augmented_gram_pinv,     # A = H G⁺ без X̃⁺
+}
+
+CSV_FIELDS = [
+    "x", "y", "method", "dtype", "shape", "shared_time", "fit_time",
+    "l1", "mse", "rmse", "output",
+]
+
+
+def read_pairs(source: str):
+    """
+    повертає список пар (x_path, y_path) з теки або CSV-маніфесту.
+    у теці xN.bmp поєднується з yN.bmp за суфіксом N; якщо для якогось
+    файлу пари немає — ValueError
+    """
+    if os.path.isdir(source):
+        xs = {_stem(p)[1:]: p for p in glob.glob(os.path.join(source, "x*.bmp"))}
+        ys = {_stem(p)[1:]: p for p in glob.glob(os.path.join(source, "y*.bmp"))}
+        unmatched = sorted([os.path.basename(p) for key, p in xs.items() if key not in ys]
+                           + [os.path.basename(p) for key, p in ys.items() if key not in xs])
+        if unmatched:
+            raise ValueError(f"Файли без пари xN.bmp / yN.bmp у {source}: {', '.join(unmatched)}")
+        return [(xs[key], ys[key]) for key in sorted(xs)]
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, newline="", encoding="utf-8") as fh:
+        return [
+            (os.path.join(base, row["x"]), os.path.join(base, row["y"]))
+            for row in csv.DictReader(fh)
+        ]
+
+
+def group_by_input(pairs):
+    """
+    {x_path: [y_path, ...]} зі збереженням порядку появи
+    """
+    groups = OrderedDict()
+    for x_path, y_path in pairs:
+        groups.setdefault(x_path, []).append(y_path)
+    return groups
+
+
+def _stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _save_plot(path: str, X, Y, Y_hat, rmse: float) -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 3, figsize=(12, 4))
+    for ax, img, title in zip(
+        axes, (X, Y, Y_hat), ("X", "Y", f"Ŷ, RMSE = {rmse:.4f}")
+    ):
+        ax.imshow(img, cmap="gray", vmin=0, vmax=1)
+        ax.set_title(title)
+        ax.axis("off")
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+
+
+# кеш процесу: ключ — cache_dir, спільний для всіх груп, які обробляє процес
+_CACHES = {}
+
+
+def worker_cache(cache_dir=None) -> PseudoInverseCache:
+    cache = _CACHES.get(cache_dir)
+    if cache is None:
+        cache = _CACHES[cache_dir] = PseudoInverseCache(disk_dir=cache_dir)
+    return cache
+
+
+def process_group(x_path: str, y_paths, method: str, out_dir: str,
+                  plots: bool = False, cache_dir=None, dtype=np.float64,
+                  tile=None):
+    """
+    один X — багато Y: спільна частина (X̃⁺ або G⁺) рахується один раз,
+    далі для кожного Y лише множення матриць.
+    повертає список рядків для CSV
+    """
+    # X лишається uint8 (для BMP — відображеним у пам'ять). для X̃⁺ вона
+    # переводиться у float один раз, одразу в X̃; прямий МНК бере її блоками
+    # по tile стовпців і повної float-копії не створює зовсім
+    X_raw = read_grayscale_image(x_path, dtype=np.uint8, mmap=True)
+
+    start = time.perf_counter()
+    if method == "direct":
+        X_tilde = None
+        X = operand = X_raw
+        params = {"tile": tile, "dtype": np.dtype(dtype).name}
+    else:
+        X_tilde = operand = augment_with_ones(X_raw, dtype)
+        X = X_tilde[:-1]
+        params = {}
+    shared_method = worker_cache(cache_dir).wrap(METHODS[method])
+    shared, _ = shared_method(operand, **params)
+    shared_time = time.perf_counter() - start
+
+    rows = []
+    for y_path in y_paths:
+        # читання Y — поза fit_time, щоб час методів був порівнянним
+        Y = read_and_resize(y_path, X.shape, np.uint8 if method == "direct" else dtype)
+        start = time.perf_counter()
+        if method == "direct":
+            A = augmented_cross(Y, X, tile, dtype) @ shared
+            Y_hat = apply_operator(A, X, tile)
+        else:
+            A = Y @ shared
+            Y_hat = A @ X_tilde
+        fit_time = time.perf_counter() - start
+
+        error_norm, mse, rmse = compute_errors(Y, Y_hat, tile)
+        np.clip(Y_hat, 0.0, 1.0, out=Y_hat)
+
+        name = f"{_stem(x_path)}__{_stem(y_path)}__{method}"
+        out_path = os.path.join(out_dir, name + ".bmp")
+        save_grayscale_image(out_path, Y_hat)
+        if plots:
+            _save_plot(os.path.join(out_dir, name + ".png"),
+                       as_unit_float(X), as_unit_float(Y), Y_hat, rmse)
+
+        rows.append({
+            "x": x_path,
+            "y": y_path,
+            "method": method,
+            "dtype": np.dtype(dtype).name,
+            "shape": f"{X.shape[0]}x{X.shape[1]}",
+            "shared_time": f"{shared_time:.6f}",
+            "fit_time": f"{fit_time:.6f}",
+            "l1": f"{error_norm:.6f}",
+            "mse": f"{mse:.6e}",
+            "rmse": f"{rmse:.6e}",
+            "output": out_path,
+        })
+    return rows
+
+
+def run_batch(source: str, method: str = "direct", out_dir: str = "results/batch",
+              workers=None, plots: bool = False, cache_dir=None,
+              dtype=np.float64, tile=None) -> str:
+    """
+    обробляє всі пари з source і пише timings.csv в out_dir.
+    повертає шлях до CSV
+    """
+    if method not in METHODS:
+        raise ValueError(f"Невідомий метод {method!r}, доступні: {', '.join(METHODS)}")
+
+    groups = group_by_input(read_pairs(source))
+    os.makedirs(out_dir, exist_ok=True)
+    print(f"Пар: {sum(len(v) for v in groups.values())}, різних X: {len(groups)}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(process_group, x_path, y_paths, method, out_dir, plots,
+                        cache_dir, dtype, tile)
+            for x_path, y_paths in groups.items()
+        ]
+        rows = [row for fut in futures for row in fut.result()]
+
+    csv_path = os.path.join(out_dir, "timings.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"Результати: {out_dir}, таблиця: {csv_path}")
+    return csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетне перетворення пар зображень (X, Y)")
+    parser.add_argument("source", help="тека з x*.bmp / y*.bmp або CSV-маніфест зі стовпцями x,y")
+    parser.add_argument("--method", default="direct", choices=list(METHODS))
+    parser.add_argument("--out", default=os.path.join("results", "batch"))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--plots", action="store_true", help="зберегти PNG для кожної пари")
+    parser.add_argument("--cache-dir", default=None, help="тека для дискового кешу X̃⁺ (*.npy)")
+    parser.add_argument("--precision", default="float64", choices=["float64", "float32"])
+    parser.add_argument("--tile", type=int, default=None,
+                        help="ширина блоку стовпців для прямого МНК (обмежує пам'ять)")
+    args = parser.parse_args()
+
+    run_batch(args.source, args.method, args.out, args.workers, args.plots,
+              args.cache_dir, np.dtype(args.precision), args.tile)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,107 @@
 # file: image_io.py
 
+import struct
+
 import numpy as np
 from PIL import Image
 
 
-def read_grayscale_image(path: str) -> np.ndarray:
+def float_dtype(arr: np.ndarray, dtype=None) -> np.dtype:
+    """
+    робочий тип для обчислень: явно заданий dtype, інакше float32/float64
+    масиву як є, а для цілих — float64
+    """
+    if dtype is not None:
+        return np.dtype(dtype)
+    if arr.dtype in (np.float32, np.float64):
+        return arr.dtype
+    return np.dtype(np.float64)
+
+
+def as_unit_float(arr: np.ndarray, dtype=None, out=None) -> np.ndarray:
+    """
+    переводить пікселі у float з [0, 1] одним проходом:
+    цілі (uint8) діляться на 255, дробові лише приводяться до dtype.
+    dtype=None — див. float_dtype; out — готовий буфер (наприклад,
+    частина X̃), щоб уникнути ще однієї копії
+    """
+    dtype = float_dtype(arr, dtype) if out is None else out.dtype
+    if np.issubdtype(arr.dtype, np.integer):
+        return np.divide(arr, 255.0, out=out, dtype=dtype, casting="unsafe")
+    if out is None:
+        return np.asarray(arr, dtype=dtype)
+    out[...] = arr
+    return out
+
+
+def memmap_raw(path: str, shape: tuple, dtype=np.uint8, offset: int = 0) -> np.ndarray:
+    """
+    відображає сирі пікселі (без заголовка або з відомим зсувом) у пам'ять
+    """
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def memmap_bmp(path: str):
+    """
+    відображає пікселі 8-бітного нестиснутого BMP з сірою палітрою у пам'ять.
+    повертає вид (height, width) у звичному порядку рядків
+    або None, якщо формат не підходить (тоді файл декодує PIL)
+    """
+    with open(path, "rb") as fh:
+        header = fh.read(54)
+        if len(header) < 54 or header[:2] != b"BM":
+            return None
+        offset, = struct.unpack_from("<I", header, 10)
+        dib_size, width, height, _, bpp, compression = struct.unpack_from("<IiiHHI", header, 14)
+        if bpp != 8 or compression != 0 or width <= 0 or height == 0:
+            return None
+        colors, = struct.unpack_from("<I", header, 46)
+        colors = colors or 256
+        fh.seek(14 + dib_size)
+        palette = np.frombuffer(fh.read(4 * colors), dtype=np.uint8)
+
+    # палітра має бути тотожною: індекс i -> (i, i, i), інакше пікселі треба перекодувати
+    if palette.size != 4 * colors:
+        return None
+    palette = palette.reshape(colors, 4)[:, :3]
+    if not np.array_equal(palette, np.repeat(np.arange(colors, dtype=np.uint8)[:, None], 3, axis=1)):
+        return None
+
+    stride = (width + 3) & ~3           # рядки BMP вирівняні до 4 байт
+    rows = abs(height)
+    data = memmap_raw(path, (rows, stride), np.uint8, offset)[:, :width]
+    # додатна висота — рядки зберігаються знизу вгору
+    return data[::-1] if height > 0 else data
+
+
+def read_grayscale_image(path: str, dtype=np.float64, mmap: bool = False) -> np.ndarray:
     """
     зчитує зображення, повертає матрицю float у [0, 1]
+
+    dtype=np.float32 — одинарна точність (вдвічі менше пам'яті).
+    dtype=np.uint8 — пікселі без перетворення (0..255), у float їх переведе
+    as_unit_float там, де вони справді потрібні (наприклад, при побудові X̃).
+    mmap=True — для 8-бітних BMP пікселі не читаються в пам'ять, а
+    відображаються через np.memmap (лише разом з dtype=np.uint8)
     """
+    if mmap and np.dtype(dtype) == np.uint8:
+        arr = memmap_bmp(path)
+        if arr is not None:
+            return arr
+
     img = Image.open(path).convert("L")      # L - grayscale
-    arr = np.asarray(img, dtype=np.float64)
-    arr /= 255.0
-    return arr
+    raw = np.asarray(img)
+    if np.dtype(dtype) == np.uint8:
+        return raw
+    return as_unit_float(raw, dtype)
 
 
 def save_grayscale_image(path: str, matrix: np.ndarray) -> None:
     """
     зберігає матрицю (float або int) як 8-бітне зображення,значення матриці обрізаються до [0, 1] перед масштабуванням
     """
-    mat = np.asarray(matrix, dtype=np.float64)
-    mat = np.clip(mat, 0.0, 1.0)
+    mat = np.asarray(matrix)
+    mat = np.clip(mat, 0.0, 1.0, dtype=float_dtype(mat))
     img_uint8 = (mat * 255.0).round().astype(np.uint8)
     img = Image.fromarray(img_uint8, mode="L")
     img.save(path)
@@ -4,16 +4,21 @@ import os
 
 
 from PIL import Image
-import matplotlib.pyplot as plt
 
-from image_io import read_grayscale_image, save_grayscale_image
+from image_io import (
+    read_grayscale_image,
+    save_grayscale_image,
+    as_unit_float,
+    float_dtype,
+)
 from pseudoinverse import (
-    pseudo_inverse_moore_penrose,
+    pseudo_inverse_moore_penrose_spectral,
     pseudo_inverse_greville,
-    is_pseudoinverse,
+    pseudo_inverse_randomized_svd,
+    check_pseudoinverse,
 )
 
-def read_and_resize(path: str, target_shape: tuple) -> np.ndarray:
+def read_and_resize(path: str, target_shape: tuple, dtype=np.float64) -> np.ndarray:
    
     try:
         img = Image.open(path).convert("L")
@@ -30,24 +35,49 @@ def read_and_resize(path: str, target_shape: tuple) -> np.ndarray:
         print(f"   -> Масштабування {path}: {img.size} -> {(target_w, target_h)}")
         img = img.resize((target_w, target_h), Image.Resampling.LANCZOS)
     
-    arr = np.asarray(img, dtype=np.float64)
-    arr /= 255.0
-    return arr
+    raw = np.asarray(img)
+    if np.dtype(dtype) == np.uint8:
+        return raw
+    return as_unit_float(raw, dtype)
 
-def augment_with_ones(X: np.ndarray) -> np.ndarray:
+def augment_with_ones(X: np.ndarray, dtype=None) -> np.ndarray:
     """
     додає рядок одиниць до X
         X̃ = [ X
               1 ... 1 ]
+    X̃ виділяється один раз; пікселі uint8 переводяться у [0, 1]
+    одразу в цей буфер, без проміжної float-копії X.
+    точність X̃ — dtype або float32/float64 самої X (див. float_dtype)
+    """
+    m, n = X.shape
+    X_tilde = np.empty((m + 1, n), dtype=float_dtype(X, dtype))
+    as_unit_float(X, X_tilde.dtype, out=X_tilde[:m])
+    X_tilde[m] = 1.0
+    return X_tilde
+
+
+def column_tiles(n: int, tile=None):
+    """
+    зрізи стовпців [0, n) шириною tile (None — один зріз на всю ширину)
     """
-    ones = np.ones((1, X.shape[1]), dtype=float)
-    return np.vstack((X, ones))
+    tile = n if tile is None else max(int(tile), 1)
+    for start in range(0, n, tile):
+        yield slice(start, min(start + tile, n))
 
 
-def compute_errors(Y_true: np.ndarray, Y_pred: np.ndarray):
-    diff = Y_true - Y_pred
-    error_norm = np.linalg.norm(diff, ord=1)
-    mse = np.mean(diff ** 2)
+def compute_errors(Y_true: np.ndarray, Y_pred: np.ndarray, tile=None):
+    """
+    L1 (матрична 1-норма, max суми по стовпцях), MSE та RMSE для Y - Ŷ.
+    з tile різниця рахується блоками стовпців, без повної копії Y - Ŷ;
+    Y_true може бути uint8 — блоки переводяться у [0, 1] на льоту
+    """
+    error_norm = 0.0
+    sq_sum = 0.0
+    for cols in column_tiles(Y_true.shape[1], tile):
+        diff = as_unit_float(Y_true[:, cols], Y_pred.dtype) - Y_pred[:, cols]
+        error_norm = max(error_norm, float(np.abs(diff).sum(axis=0).max(initial=0.0)))
+        sq_sum += float(np.vdot(diff, diff))
+    mse = sq_sum / Y_true.size
     rmse = np.sqrt(mse)
     return error_norm, mse, rmse
 
@@ -57,8 +87,12 @@ def build_operator_and_predict(
     Y: np.ndarray,
     pinv_method,
     method_name: str,
+    returns_rank: bool = False,
 ):
     """
+    returns_rank — другий елемент результату pinv_method не кількість
+    ітерацій, а ранг (рандомізований SVD)
+
     1)будує X̃ = [X; 1 ... 1]
     2)обчислює X̃⁺ заданим методом
     3)перевіряє умови Мура–Пенроуза
@@ -76,11 +110,25 @@ def build_operator_and_predict(
     elapsed = time.perf_counter() - start
 
     print(f"Розмір X̃⁺: {X_pinv.shape}")
-    print(f"Ітерацій: {iterations}")
+    print(f"{'Ранг' if returns_rank else 'Ітерацій'}: {iterations}")
     print(f"Час: {elapsed:.6f} c")
 
-    # Перевірка умов Мура–Пенроуза (вивід в консоль всередині функції)
-    # is_pseudoinverse(X_tilde, X_pinv) 
+    # Перевірка умов Мура–Пенроуза: стохастична оцінка на кількох
+    # випадкових векторах, без повних добутків A A⁺ та A⁺ A.
+    # допуск — за робочою точністю, як і поріг у методі Гревіля:
+    # max(m, n) · sqrt(eps), корінь — запас на обумовленість X̃
+    # (для float64 ~3e-6, для float32 ~0.07)
+    tol = max(X_tilde.shape) * np.sqrt(np.finfo(X_tilde.dtype).eps)
+    check = check_pseudoinverse(X_tilde, X_pinv, tol=tol, probes=8)
+    residuals = ", ".join(f"{r:.1e}" for r in check.residuals)
+    if returns_rank and iterations < min(X_tilde.shape):
+        # усічена псевдообернена — це A⁺ наближення рангу r, для самої X̃
+        # умова 1) A A⁺ A = A не виконується за побудовою
+        ok = all(check.passed[1:])
+        print(f"Умови 2)–4) для усіченої псевдооберненої (ранг {iterations}): "
+              f"{'так' if ok else 'ні'} (нев'язки: {residuals})")
+    else:
+        print(f"Умови Мура–Пенроуза: {'так' if check.ok else 'ні'} (нев'язки: {residuals})")
 
     # Оператор A = Y X̃⁺
     A = Y @ X_pinv
@@ -95,6 +143,7 @@ def build_operator_and_predict(
     print(f"L1 = {error_norm:.6f}")
     print(f"MSE = {mse:.6e}")
     print(f"RMSE = {rmse:.6e}")
+    report_precision(X, Y, Y_hat, rmse, pinv_method)
 
     # Обрізаємо до [0, 1] для коректного відображення
     Y_hat = np.clip(Y_hat, 0.0, 1.0)
@@ -102,57 +151,178 @@ def build_operator_and_predict(
     return Y_hat, error_norm, mse, rmse, elapsed
 
 
-def main():
-    # === Вхідні зображення ===
-    file_x = "x1.bmp"
-    file_y = "y3.bmp"  
-    
-    print(f"Завантаження {file_x}...")
-    try:
-        X = read_grayscale_image(file_x)
-    except FileNotFoundError:
-        print(f"Файл {file_x} не знайдено. Перевірте папку.")
-        return
+def augmented_gram(X: np.ndarray, tile=None, dtype=None) -> np.ndarray:
+    """
+    G = X̃ X̃ᵀ для X̃ = [X; 1 ... 1] без створення X̃:
+        G = [ X Xᵀ   X·1 ]
+            [ 1ᵀXᵀ   n   ]
+    з tile G накопичується по блоках стовпців (G = Σ X̃_b X̃_bᵀ): у float
+    переводиться лише поточний блок, тож X може лишатися uint8 / np.memmap
+    """
+    m, n = X.shape
+    dtype = float_dtype(X, dtype)
+    G = np.zeros((m + 1, m + 1), dtype=dtype)
+    for cols in column_tiles(n, tile):
+        Xb = as_unit_float(X[:, cols], dtype)
+        G[:m, :m] += Xb @ Xb.T
+        G[:m, m] += Xb.sum(axis=1)
+    G[m, :m] = G[:m, m]
+    G[m, m] = n
+    return G
+
+
+def augmented_cross(Y: np.ndarray, X: np.ndarray, tile=None, dtype=None) -> np.ndarray:
+    """
+    H = Y X̃ᵀ = [ Y Xᵀ   Y·1 ] без створення X̃ (з tile — по блоках стовпців)
+    """
+    m, n = X.shape
+    dtype = np.result_type(float_dtype(X, dtype), float_dtype(Y, dtype))
+    H = np.zeros((Y.shape[0], m + 1), dtype=dtype)
+    for cols in column_tiles(n, tile):
+        Xb = as_unit_float(X[:, cols], dtype)
+        Yb = as_unit_float(Y[:, cols], dtype)
+        H[:, :m] += Yb @ Xb.T
+        H[:, m] += Yb.sum(axis=1)
+    return H
+
+
+def augmented_normal_system(X: np.ndarray, Y: np.ndarray, tile=None, dtype=None):
+    """
+    нормальна система для X̃ = [X; 1 ... 1]: повертає (G, H),
+    G = X̃ X̃ᵀ розміру (m+1) x (m+1), H = Y X̃ᵀ розміру p x (m+1)
+    """
+    return augmented_gram(X, tile, dtype), augmented_cross(Y, X, tile, dtype)
 
-    print(f"Завантаження та підгонка {file_y}...")
-    try:
-        # Тут ми використовуємо нашу нову функцію, щоб підігнати Y під розмір X
-        Y = read_and_resize(file_y, X.shape)
-    except FileNotFoundError:
-        print(f"Файл {file_y} не знайдено. Перевірте папку.")
+
+def solve_operator(G: np.ndarray, H: np.ndarray) -> np.ndarray:
+    """
+    A = H G⁺ через спектральний розклад малої матриці G = V Λ Vᵀ.
+    для H = Y X̃ᵀ, G = X̃ X̃ᵀ це те саме A = Y X̃⁺ (мінімальної норми),
+    але без X̃⁺ розміру n x (m+1)
+    """
+    lam, V = np.linalg.eigh(G)
+    keep = lam > lam.max(initial=0.0) * G.shape[0] * np.finfo(lam.dtype).eps
+    inv_lam = np.zeros_like(lam)
+    inv_lam[keep] = 1.0 / lam[keep]
+    return ((H @ V) * inv_lam) @ V.T
+
+
+def apply_operator(A: np.ndarray, X: np.ndarray, tile=None, out=None) -> np.ndarray:
+    """
+    Ŷ = A X̃ = A[:, :m] X + A[:, m] 1ᵀ — рядок одиниць враховується як зсув.
+    з tile Ŷ заповнюється по блоках стовпців; out — готовий буфер
+    (наприклад, np.memmap), щоб результат теж не тримати в пам'яті
+    """
+    if out is None:
+        out = np.empty((A.shape[0], X.shape[1]), dtype=A.dtype)
+    for cols in column_tiles(X.shape[1], tile):
+        np.matmul(A[:, :-1], as_unit_float(X[:, cols], A.dtype), out=out[:, cols])
+        out[:, cols] += A[:, -1:]
+    return out
+
+
+def reference_operator(X: np.ndarray, Y: np.ndarray, pinv_method=None, tile=None) -> np.ndarray:
+    """
+    оператор A того самого методу, але у float64: pinv_method — метод
+    псевдообернення (A = Y X̃⁺), None — прямий МНК (A = H G⁺).
+    Y переводиться у float64 по блоках стовпців
+    """
+    if pinv_method is None:
+        return solve_operator(*augmented_normal_system(X, Y, tile, np.float64))
+    X_pinv, _ = pinv_method(augment_with_ones(X, np.float64))
+    A = np.zeros((Y.shape[0], X_pinv.shape[1]))
+    for cols in column_tiles(X.shape[1], tile):
+        A += as_unit_float(Y[:, cols], np.float64) @ X_pinv[cols]
+    return A
+
+
+def precision_impact(X: np.ndarray, Y: np.ndarray, Y_hat: np.ndarray, pinv_method=None,
+                     tile=None):
+    """
+    втрати від float32: Ŷ порівнюється з результатом того самого методу
+    у float64 (див. reference_operator), а не іншого методу.
+    Ŷ_64 та суми рахуються по блоках стовпців: у float64 переводяться
+    лише поточні блоки X та Y, без повних копій.
+    повертає (RMSE еталону, max |Ŷ - Ŷ_64|)
+    """
+    A_ref = reference_operator(X, Y, pinv_method, tile)
+    sq_sum = 0.0
+    max_dev = 0.0
+    for cols in column_tiles(X.shape[1], tile):
+        Y_ref = A_ref[:, :-1] @ as_unit_float(X[:, cols], np.float64) + A_ref[:, -1:]
+        diff = as_unit_float(Y[:, cols], np.float64) - Y_ref
+        sq_sum += float(np.vdot(diff, diff))
+        max_dev = max(max_dev, float(np.abs(Y_hat[:, cols] - Y_ref).max(initial=0.0)))
+    return np.sqrt(sq_sum / Y.size), max_dev
+
+
+def report_precision(X: np.ndarray, Y: np.ndarray, Y_hat: np.ndarray, rmse: float,
+                     pinv_method=None, tile=None) -> None:
+    """
+    друкує вплив точності поруч з RMSE (лише якщо рахували не у float64)
+    """
+    if Y_hat.dtype == np.float64:
         return
+    rmse_ref, max_dev = precision_impact(X, Y, Y_hat, pinv_method, tile)
+    print(f"Точність {Y_hat.dtype}: RMSE(float64) = {rmse_ref:.6e}, "
+          f"ΔRMSE = {rmse - rmse_ref:+.3e}, max |Ŷ - Ŷ_64| = {max_dev:.3e}")
 
-    print(f"X shape = {X.shape}")
-    print(f"Y shape = {Y.shape}")
 
-    X_mat = X.copy()
-    Y_mat = Y.copy()
+def build_operator_direct_and_predict(
+    X: np.ndarray,
+    Y: np.ndarray,
+    method_name: str = "Прямий МНК",
+    tile=None,
+    dtype=None,
+):
+    """
+    той самий оператор A = Y X̃⁺, але без явного X̃⁺ і без X̃:
+    1) збирає нормальну систему G = X̃ X̃ᵀ, H = Y X̃ᵀ
+    2) розв'язує A = H G⁺
+    3) рахує Ŷ = A X̃ та помилки
+
+    tile — ширина блоку стовпців: X та Y (можна uint8 / np.memmap з диска)
+    проходяться блоками, і в пам'яті окрім Ŷ лише матриці (m+1) x (m+1)
+    та p x (m+1).
+    повертає той самий кортеж, що й build_operator_and_predict
+    """
+    print(f"\n=== Метод {method_name} ===")
+    print(f"Розмір X̃: {(X.shape[0] + 1, X.shape[1])}, розмір Y: {Y.shape}")
+    if tile is not None:
+        print(f"Блоки стовпців: {tile}")
 
-    # === Мур–Пенроуз ===
-    Y_hat_MP, err_MP, mse_MP, rmse_MP, time_MP = build_operator_and_predict(
-        X_mat, Y_mat, pseudo_inverse_moore_penrose, "Мур–Пенроуз"
-    )
-    save_grayscale_image("result_moore_penrose.bmp", Y_hat_MP)
+    start = time.perf_counter()
+    G, H = augmented_normal_system(X, Y, tile, dtype)
+    A = solve_operator(G, H)
+    elapsed = time.perf_counter() - start
 
-    # === Гревіль ===
-    Y_hat_G, err_G, mse_G, rmse_G, time_G = build_operator_and_predict(
-        X_mat, Y_mat, pseudo_inverse_greville, "Гревіль"
-    )
-    save_grayscale_image("result_greville.bmp", Y_hat_G)
+    print(f"Розмір оператора A: {A.shape}")
+    print(f"Час: {elapsed:.6f} c")
 
-    # === Порівняння в консолі ===
-    print("\n=== Порівняння методів ===")
-    print(f"Мур–Пенроуз: час = {time_MP:.6f} с, RMSE = {rmse_MP:.6e}")
-    print(f"Гревіль    : час = {time_G:.6f} с, RMSE = {rmse_G:.6e}")
+    Y_hat = apply_operator(A, X, tile)
 
-    if rmse_MP < rmse_G:
-        print("Метод Мур–Пенроуза дав точніший результат.")
-    elif rmse_MP > rmse_G:
-        print("Метод Гревіля дав точніший результат.")
-    else:
-        print("Методи дали однаковий результат (в межах похибки).")
+    error_norm, mse, rmse = compute_errors(Y, Y_hat, tile)
+    print(f"L1 = {error_norm:.6f}")
+    print(f"MSE = {mse:.6e}")
+    print(f"RMSE = {rmse:.6e}")
+    report_precision(X, Y, Y_hat, rmse, tile=tile)
+
+    np.clip(Y_hat, 0.0, 1.0, out=Y_hat)
+
+    return Y_hat, error_norm, mse, rmse, elapsed
+
+
+def plot_dashboard(X_mat, Y_mat, Y_hat_MP, Y_hat_G, rmse_MP, rmse_G, rmse_R,
+                   time_MP, time_G, time_R, rank_R, show=True):
+    """
+    графічне порівняння методів у results/comparison_dashboard.png.
+    matplotlib імпортується лише тут; show=False — бекенд Agg, без вікна
+    """
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")      # без GUI: лише файл
+    import matplotlib.pyplot as plt
 
-    # === Графічне порівняння ===
     os.makedirs("results", exist_ok=True)
 
     fig = plt.figure(figsize=(16, 10))
@@ -203,10 +373,13 @@ def main():
 
     # 7. Барчарт часу
     ax7 = plt.subplot(2, 4, 7)
-    methods = ["Мур–Пенроуз", "Гревіль"]
-    times = [time_MP, time_G]
+    methods = ["Мур–Пенроуз", "Гревіль", f"rSVD (r={rank_R})"]
+    times = [time_MP, time_G, time_R]
     bars_time = ax7.bar(methods, times)
-    ax7.set_title("Час виконання")
+    ax7.set_title(
+        f"Час виконання\nrSVD: ×{time_MP / time_R:.1f} vs Мур–Пенроуз, "
+        f"×{time_G / time_R:.1f} vs Гревіль"
+    )
     ax7.set_ylabel("секунди")
     ax7.grid(axis="y", alpha=0.3)
     for bar, t in zip(bars_time, times):
@@ -222,7 +395,7 @@ def main():
 
     # 8. Барчарт RMSE
     ax8 = plt.subplot(2, 4, 8)
-    rmses = [rmse_MP, rmse_G]
+    rmses = [rmse_MP, rmse_G, rmse_R]
     bars_rmse = ax8.bar(methods, rmses)
     ax8.set_title("Помилка RMSE")
     ax8.set_ylabel("RMSE")
@@ -244,7 +417,110 @@ def main():
     print(f"\nГрафічний підсумок збережено у файлі: {out_path}")
     
     # Показуємо вікно з графіками
-    plt.show()
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def main(dtype=np.float64, tile=None, plots="show"):
+    # === Вхідні зображення ===
+    file_x = "x1.bmp"
+    file_y = "y3.bmp"  
+    
+    print(f"Завантаження {file_x}...")
+    try:
+        X = read_grayscale_image(file_x, dtype)
+    except FileNotFoundError:
+        print(f"Файл {file_x} не знайдено. Перевірте папку.")
+        return
+
+    print(f"Завантаження та підгонка {file_y}...")
+    try:
+        # Тут ми використовуємо нашу нову функцію, щоб підігнати Y під розмір X
+        Y = read_and_resize(file_y, X.shape, dtype)
+    except FileNotFoundError:
+        print(f"Файл {file_y} не знайдено. Перевірте папку.")
+        return
+
+    print(f"X shape = {X.shape}")
+    print(f"Y shape = {Y.shape}")
+    print(f"Точність: {np.dtype(dtype)}")
+
+    X_mat = X.copy()
+    Y_mat = Y.copy()
+
+    # === Мур–Пенроуз ===
+    # спектральний варіант дає ту ж послідовність δ, але з одним розкладом
+    Y_hat_MP, err_MP, mse_MP, rmse_MP, time_MP = build_operator_and_predict(
+        X_mat, Y_mat, pseudo_inverse_moore_penrose_spectral, "Мур–Пенроуз"
+    )
+    save_grayscale_image("result_moore_penrose.bmp", Y_hat_MP)
+
+    # === Гревіль ===
+    Y_hat_G, err_G, mse_G, rmse_G, time_G = build_operator_and_predict(
+        X_mat, Y_mat, pseudo_inverse_greville, "Гревіль"
+    )
+    save_grayscale_image("result_greville.bmp", Y_hat_G)
+
+    # === Рандомізований SVD ===
+    # другий елемент результату цього методу — ранг, запам'ятовуємо його для графіків
+    rsvd_rank = []
+
+    def rsvd_method(A):
+        A_plus, rank = pseudo_inverse_randomized_svd(A)
+        rsvd_rank.append(rank)
+        return A_plus, rank
+
+    Y_hat_R, err_R, mse_R, rmse_R, time_R = build_operator_and_predict(
+        X_mat, Y_mat, rsvd_method, "Рандомізований SVD", returns_rank=True
+    )
+    rank_R = rsvd_rank[0]      # далі можуть бути виклики для еталону у float64
+    save_grayscale_image("result_randomized_svd.bmp", Y_hat_R)
+
+    # === Прямий МНК (без X̃⁺) ===
+    _, _, _, rmse_D, time_D = build_operator_direct_and_predict(X_mat, Y_mat, tile=tile)
+
+    # === Порівняння в консолі ===
+    print("\n=== Порівняння методів ===")
+    print(f"Мур–Пенроуз: час = {time_MP:.6f} с, RMSE = {rmse_MP:.6e}")
+    print(f"Гревіль    : час = {time_G:.6f} с, RMSE = {rmse_G:.6e}")
+    print(f"rSVD (r={rank_R:<3d}): час = {time_R:.6f} с, RMSE = {rmse_R:.6e}")
+    print(f"Прямий МНК : час = {time_D:.6f} с, RMSE = {rmse_D:.6e}")
+    print(f"Прискорення rSVD: ×{time_MP / time_R:.1f} відносно Мура–Пенроуза, "
+          f"×{time_G / time_R:.1f} відносно Гревіля")
+    full_rank = min(X_mat.shape[0] + 1, X_mat.shape[1])
+    if rank_R < full_rank:
+        # rSVD зберігає частку energy від ||X̃||_F² і відкидає решту напрямків:
+        # швидше, але оператор A лише наближений
+        print(f"rSVD усічений до рангу {rank_R} з {full_rank}: RMSE на "
+              f"{100 * (rmse_R / rmse_MP - 1):+.0f}% відносно Мура–Пенроуза "
+              f"(точний ранг — energy=1.0)")
+
+    if rmse_MP < rmse_G:
+        print("Метод Мур–Пенроуза дав точніший результат.")
+    elif rmse_MP > rmse_G:
+        print("Метод Гревіля дав точніший результат.")
+    else:
+        print("Методи дали однаковий результат (в межах похибки).")
+
+    # === Графічне порівняння ===
+    # plots="none" — matplotlib не імпортується зовсім,
+    # "headless" — лише PNG з бекендом Agg, без вікна (графік потребує
+    # результатів усіх методів, тож окремий процес тут нічого не перекриває)
+    if plots == "none":
+        return
+    plot_dashboard(X_mat, Y_mat, Y_hat_MP, Y_hat_G, rmse_MP, rmse_G, rmse_R,
+                   time_MP, time_G, time_R, rank_R, show=(plots == "show"))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Лабораторна 2: оператор перетворення X -> Y")
+    parser.add_argument("--precision", default="float64", choices=["float64", "float32"])
+    parser.add_argument("--tile", type=int, default=None,
+                        help="ширина блоку стовпців для прямого МНК")
+    parser.add_argument("--plots", default="show", choices=["show", "headless", "none"],
+                        help="show — вікно з графіком, headless — лише PNG, "
+                             "none — без matplotlib")
+    args = parser.parse_args()
+    main(np.dtype(args.precision), args.tile, args.plots)
\ No newline at end of file
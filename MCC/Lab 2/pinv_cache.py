@@ -0,0 +1,150 @@
+# file: pinv_cache.py
+
+import glob
+import hashlib
+import inspect
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+# обсяг блоку рядків, яким хешується операнд у array_key
+HASH_BLOCK_BYTES = 4 * 2**20
+
+
+def method_params(pinv_method, A: np.ndarray, **params) -> dict:
+    """
+    параметри виклику pinv_method(A, **params) разом зі значеннями за
+    замовчуванням (eps, tol, ...), без самої матриці — щоб явний і неявний
+    виклик з однаковими значеннями давали один ключ
+    """
+    bound = inspect.signature(pinv_method).bind(A, **params)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop(next(iter(arguments)))
+    return arguments
+
+
+def array_key(A: np.ndarray, method: str, **params) -> str:
+    """
+    ключ кешу: хеш байтів масиву + форма, dtype, назва методу та його параметри.
+    байти подаються блоками рядків по ~block_bytes, тож для memmap чи
+    несуцільного (F-порядок, зріз) масиву копіюється лише поточний блок,
+    а не весь операнд; ключ збігається з хешем C-порядку всього масиву
+    """
+    A = np.asanyarray(A)
+    rows = A.reshape(1) if A.ndim == 0 else A
+    step = max(1, HASH_BLOCK_BYTES // max(1, rows[:1].nbytes))
+    h = hashlib.blake2b(digest_size=20)
+    for start in range(0, len(rows) if A.size else 0, step):
+        block = np.ascontiguousarray(rows[start:start + step])
+        h.update(memoryview(block).cast("B"))
+    h.update(repr((A.shape, A.dtype.str, method, sorted(params.items()))).encode())
+    return h.hexdigest()
+
+
+class PseudoInverseCache:
+    """
+    кеш псевдообернених матриць з LRU-витісненням за обсягом пам'яті
+    та необов'язковим дисковим рівнем (*.npy у disk_dir).
+
+    повторний виклик з тим самим X̃ (і тими ж параметрами методу)
+    повертає збережену (A_plus, iterations) замість повторного обчислення.
+    збережені масиви лише для читання.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, disk_dir=None):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()    # key -> (A_plus, iterations)
+        self._bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _remember(self, key: str, A_plus: np.ndarray, iterations: int) -> None:
+        A_plus.flags.writeable = False
+        if A_plus.nbytes > self.max_bytes:
+            return
+        self._entries[key] = (A_plus, iterations)
+        self._bytes += A_plus.nbytes
+        while self._bytes > self.max_bytes:
+            _, (old, _) = self._entries.popitem(last=False)
+            self._bytes -= old.nbytes
+
+    def _disk_path(self, key: str, iterations: int) -> str:
+        return os.path.join(self.disk_dir, f"{key}-{iterations}.npy")
+
+    def _save_to_disk(self, key: str, A_plus: np.ndarray, iterations: int) -> None:
+        """
+        запис через тимчасовий файл у disk_dir і os.replace: обірваний запис
+        або паралельний процес ніколи не лишають під ключем неповний *.npy
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, A_plus)
+            os.replace(tmp_path, self._disk_path(key, iterations))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _load_from_disk(self, key: str):
+        if self.disk_dir is None:
+            return None
+        found = glob.glob(os.path.join(self.disk_dir, f"{key}-*.npy"))
+        if not found:
+            return None
+        path = found[0]
+        iterations = int(os.path.splitext(path)[0].rsplit("-", 1)[1])
+        return np.load(path), iterations
+
+    def get(self, A: np.ndarray, pinv_method, **params):
+        """
+        (A_plus, iterations) для A: з пам'яті, з диска або через pinv_method(A, **params)
+        """
+        key = array_key(A, pinv_method.__name__, **method_params(pinv_method, A, **params))
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        entry = self._load_from_disk(key)
+        if entry is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            A_plus, iterations = pinv_method(A, **params)
+            entry = (np.asarray(A_plus), int(iterations))
+            if self.disk_dir is not None:
+                self._save_to_disk(key, *entry)
+
+        self._remember(key, *entry)
+        return entry
+
+    def wrap(self, pinv_method):
+        """
+        обгортка з тим самим контрактом, що й pinv_method: A -> (A_plus, iterations)
+        """
+        def cached(A, **params):
+            return self.get(A, pinv_method, **params)
+
+        cached.__name__ = pinv_method.__name__
+        cached.__doc__ = pinv_method.__doc__
+        return cached
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
@@ -1,24 +1,98 @@
 # file: pseudoinverse.py
 
+from typing import NamedTuple
+
 import numpy as np
 
 
+def _as_float_matrix(A: np.ndarray) -> np.ndarray:
+    """
+    float32 і float64 лишаються як є (робоча точність задається входом),
+    решта типів приводиться до float64
+    """
+    A = np.asarray(A)
+    if A.dtype in (np.float32, np.float64):
+        return A
+    return A.astype(np.float64)
+
+
+class PseudoinverseCheck(NamedTuple):
+    """
+    результат перевірки 4 умов Мура–Пенроуза:
+      residuals — відносні нев'язки умов 1)–4)
+      passed    — residuals[i] <= tol
+      ok        — усі умови виконано
+      probes    — кількість випадкових векторів (0 — точна перевірка)
+    """
+    residuals: tuple
+    passed: tuple
+    ok: bool
+    probes: int
+
+
+def _rel(diff: np.ndarray, ref: np.ndarray) -> float:
+    ref_norm = np.linalg.norm(ref)
+    return float(np.linalg.norm(diff) / ref_norm) if ref_norm > 0 else float(np.linalg.norm(diff))
+
+
+def check_pseudoinverse(A: np.ndarray,
+                        A_plus: np.ndarray,
+                        tol: float = 1e-8,
+                        probes: int = 0,
+                        seed: int = 0) -> PseudoinverseCheck:
+    """
+    нев'язки 4 умов Мура–Пенроуза без друку.
+
+    probes = 0 — точно: A A⁺ та A⁺ A рахуються по одному разу,
+      1) ||A A⁺ A - A|| / ||A||        2) ||A⁺ A A⁺ - A⁺|| / ||A⁺||
+      3) ||A A⁺ - (A A⁺)ᵀ|| / ||A A⁺||  4) ||A⁺ A - (A⁺ A)ᵀ|| / ||A⁺ A||
+    probes = k > 0 — стохастична оцінка тих самих нев'язок на k випадкових
+      векторах: лише добутки матриця-блок векторів, O(mnk) замість O(mn·min(m,n));
+      для 3), 4) порівнюється Wᵀ(A A⁺)W з транспонованою.
+    """
+    A = np.asarray(A)
+    A_plus = np.asarray(A_plus)
+    m, n = A.shape
+
+    if probes <= 0:
+        P = A @ A_plus          # m x m
+        Q = A_plus @ A          # n x n
+        residuals = (
+            _rel(P @ A - A, A),
+            _rel(A_plus @ P - A_plus, A_plus),
+            _rel(P - P.T, P),
+            _rel(Q - Q.T, Q),
+        )
+    else:
+        rng = np.random.default_rng(seed)
+        W_n = rng.standard_normal((n, probes)).astype(A.dtype)
+        W_m = rng.standard_normal((m, probes)).astype(A.dtype)
+
+        AW = A @ W_n                        # A w
+        ApW = A_plus @ W_m                  # A⁺ w
+        PW = A @ ApW                        # A A⁺ w
+        QW = A_plus @ AW                    # A⁺ A w
+        S_P = W_m.T @ PW                    # Wᵀ (A A⁺) W
+        S_Q = W_n.T @ QW                    # Wᵀ (A⁺ A) W
+        residuals = (
+            _rel(A @ QW - AW, AW),
+            _rel(A_plus @ PW - ApW, ApW),
+            _rel(S_P - S_P.T, S_P),
+            _rel(S_Q - S_Q.T, S_Q),
+        )
+
+    passed = tuple(r <= tol for r in residuals)
+    return PseudoinverseCheck(residuals, passed, all(passed), max(int(probes), 0))
+
+
 def is_pseudoinverse(A: np.ndarray,
                      A_plus: np.ndarray,
                      tol: float = 1e-8) -> bool:
     """
     перевірка 4 умов Мура–Пенроуза для псевдооберненої матриці
     """
-    # 1) A A⁺ A = A
-    cond1 = np.allclose(A @ A_plus @ A, A, atol=tol)
-    # 2) A⁺ A A⁺ = A⁺
-    cond2 = np.allclose(A_plus @ A @ A_plus, A_plus, atol=tol)
-    # 3) A A⁺ симетрична
-    AA_plus = A @ A_plus
-    cond3 = np.allclose(AA_plus, AA_plus.T, atol=tol)
-    # 4) A⁺ A симетрична
-    A_plusA = A_plus @ A
-    cond4 = np.allclose(A_plusA, A_plusA.T, atol=tol)
+    check = check_pseudoinverse(A, A_plus, tol)
+    cond1, cond2, cond3, cond4 = check.passed
 
     print("Перевірка умов Мура–Пенроуза:")
     print(f"  1) A A⁺ A ≈ A : {cond1}")
@@ -26,7 +100,7 @@ def is_pseudoinverse(A: np.ndarray,
     print(f"  3) A A⁺ симетрична : {cond3}")
     print(f"  4) A⁺ A симетрична : {cond4}")
 
-    return cond1 and cond2 and cond3 and cond4
+    return check.ok
 
 
 def pseudo_inverse_moore_penrose(A: np.ndarray,
@@ -42,7 +116,7 @@ def pseudo_inverse_moore_penrose(A: np.ndarray,
     або не досягнемо max_iter.
     повертає (A_plus, iterations).
     """
-    A = np.asarray(A, dtype=float)
+    A = _as_float_matrix(A)
     m, n = A.shape
 
     delta = float(delta_init)
@@ -50,11 +124,11 @@ def pseudo_inverse_moore_penrose(A: np.ndarray,
     def compute_A_plus(delta_val: float) -> np.ndarray:
         if m <= n:
             # використовуємо Aᵀ (A Aᵀ + δ² I)⁻¹
-            M = A @ A.T + (delta_val ** 2) * np.eye(m)
+            M = A @ A.T + (delta_val ** 2) * np.eye(m, dtype=A.dtype)
             return A.T @ np.linalg.inv(M)
         else:
             # використовуємо (Aᵀ A + δ² I)⁻¹ Aᵀ
-            M = A.T @ A + (delta_val ** 2) * np.eye(n)
+            M = A.T @ A + (delta_val ** 2) * np.eye(n, dtype=A.dtype)
             return np.linalg.inv(M) @ A.T
 
     A_prev = compute_A_plus(delta)
@@ -76,50 +150,179 @@ def pseudo_inverse_moore_penrose(A: np.ndarray,
     return A_prev, iterations
 
 
+def pseudo_inverse_moore_penrose_spectral(A: np.ndarray,
+                                          eps: float = 1e-6,
+                                          delta_init: float = 10.0,
+                                          max_iter: int = 1000):
+    """
+    той самий граничний перехід Мура–Пенроуза, але без повторних обернень.
+
+    матриця Грама G (A Aᵀ або Aᵀ A) розкладається один раз: G = V Λ Vᵀ, тоді
+      A⁺(δ) = Aᵀ V diag(1 / (λ + δ²)) Vᵀ   (якщо m <= n)
+      A⁺(δ) = V diag(1 / (λ + δ²)) Vᵀ Aᵀ   (якщо m > n)
+    і ||A⁺(δ/2) - A⁺(δ)||_F² = Σ λ (1/(λ + δ²/4) - 1/(λ + δ²))²
+    залежить лише від власних значень. тому всю послідовність δ_k = δ₀ / 2^k
+    перевіряємо векторно і будуємо A⁺ один раз для першого δ_k,
+    де критерій виконано.
+    повертає (A_plus, iterations) з тією ж кількістю ітерацій,
+    що й pseudo_inverse_moore_penrose.
+    """
+    A = _as_float_matrix(A)
+    m, n = A.shape
+
+    G = A @ A.T if m <= n else A.T @ A
+    lam, V = np.linalg.eigh(G)
+    lam = lam.astype(np.float64)    # перебір δ дешевий, тож завжди у float64
+    # λ на рівні шуму округлення вважаємо нулем: такі напрямки не дають внеску в A⁺
+    positive = lam > lam.max(initial=0.0) * max(m, n) * np.finfo(A.dtype).eps
+    lam = np.where(positive, lam, 0.0)
+
+    # δ_0, δ_1, ..., δ_max_iter та відповідні різниці між сусідніми наближеннями
+    deltas_sq = (float(delta_init) / 2.0 ** np.arange(max_iter + 1)) ** 2
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        inv_shift = np.where(positive, 1.0 / (lam[None, :] + deltas_sq[:, None]), 0.0)
+    steps = np.diff(inv_shift, axis=0)
+    diffs = np.sqrt(np.sum(lam * steps ** 2, axis=1))
+
+    converged = np.flatnonzero(diffs < eps)
+    if converged.size:
+        iterations = int(converged[0]) + 1
+    else:
+        print("Увага: досягнуто max_iter у Moore–Penrose, збіжність до eps не гарантована.")
+        iterations = max_iter
+
+    d = inv_shift[iterations].astype(A.dtype)
+    if m <= n:
+        A_plus = A.T @ ((V * d) @ V.T)
+    else:
+        A_plus = ((V * d) @ V.T) @ A.T
+    return A_plus, iterations
+
+
 def pseudo_inverse_greville(A: np.ndarray,
-                            eps: float = 1e-10):
+                            eps: float = None):
     """
     псевдообернена матриця за методом Гревіля.
     A — розмір m x n, обробляємо рядки A як a_i^T
 
+    A⁺ зберігається в заздалегідь виділеному буфері n x m (заповнюються
+    перші k стовпців), а проектор Z = I - A⁺A не перераховується, а
+    оновлюється на місці рангово-одиничною поправкою:
+      Z_k = Z_{k-1} - (Z a)(Z a)ᵀ / (aᵀ Z a)   (якщо aᵀ Z a > eps aᵀa)
+      Z_k = Z_{k-1}                         (інакше)
+    у виродженому випадку R a = A⁺ (A⁺ᵀ a) рахується без побудови R.
+    eps — відносний поріг: частка рядка a, що лишилась поза лінійною
+    оболонкою попередніх; None — max(m, n) · np.finfo(dtype).eps, тобто
+    рівень шуму округлення в робочій точності (float32 чи float64).
+
     повертає (A_plus, iterations), де iterations = m - 1 (к-ть кроків)
     """
-    A = np.asarray(A, dtype=float)
+    A = _as_float_matrix(A)
     m, n = A.shape
+    if eps is None:
+        eps = max(m, n) * np.finfo(A.dtype).eps
 
-    # Перший рядок
-    a1 = A[0, :].reshape(n, 1)      # стовпчик
-    denom = float(a1.T @ a1)        # скаляр a1^T a1
+    A_plus = np.zeros((n, m), dtype=A.dtype)   # n x m, заповнюємо по стовпцях
+    Z = np.eye(n, dtype=A.dtype)               # Z = I - A⁺A для поточних рядків
 
-    if abs(denom) < eps:
-        A_plus = np.zeros((n, 1), dtype=float)
-    else:
-        A_plus = a1 / denom         # n x 1
+    # Перший рядок
+    a1 = A[0, :]
+    denom = float(a1 @ a1)          # скаляр a1^T a1
 
-    current_A = A[0:1, :]           # 1 x n
+    if denom > 0:
+        A_plus[:, 0] = a1 / denom
+        Z -= np.outer(a1, a1 / denom)
 
     # Послідовно додаємо рядки
     for i in range(1, m):
-        a = A[i, :].reshape(n, 1)   # n x 1
+        a = A[i, :]                 # n
+        A_prev = A_plus[:, :i]      # вид на вже заповнену частину, n x i
 
-        # Z = I - A⁺ A
-        Z = np.eye(current_A.shape[1]) - A_plus @ current_A  # n x n
-        quad_form = float(a.T @ Z @ a)                       # скаляр a^T Z a
+        Za = Z @ a
+        quad_form = float(a @ Za)   # скаляр a^T Z a
 
-        if quad_form > eps:
+        if quad_form > eps * float(a @ a):
             # випадок a^T Z a > 0
-            left = A_plus - (Z @ a @ (a.T @ A_plus)) / quad_form
-            right = (Z @ a) / quad_form
-            A_plus = np.hstack((left, right))
+            b = Za / quad_form
+            Z -= np.outer(b, Za)
         else:
             # випадок a^T Z a ≈ 0
-            R = A_plus @ A_plus.T
-            denom2 = 1.0 + float(a.T @ R @ a)
-            left = A_plus - (R @ a @ (a.T @ A_plus)) / denom2
-            right = (R @ a) / denom2
-            A_plus = np.hstack((left, right))
+            Ra = A_prev @ (a @ A_prev)
+            b = Ra / (1.0 + float(a @ Ra))
 
-        current_A = np.vstack((current_A, A[i, :]))
+        # A⁺_k = [A⁺ - b aᵀA⁺ | b]
+        A_prev -= np.outer(b, a @ A_prev)
+        A_plus[:, i] = b
 
     iterations = m - 1
     return A_plus, iterations
+
+
+def _orthogonal_complement(Q: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """
+    ортонормований базис частини Y, ортогональної до стовпців Q
+    (дві проєкції — щоб ортогональність не губилась при малих залишках)
+    """
+    for _ in range(2):
+        Y = Y - Q @ (Q.T @ Y)
+        Y = np.linalg.qr(Y)[0]
+    return Y
+
+
+def pseudo_inverse_randomized_svd(A: np.ndarray,
+                                  rank: int = None,
+                                  energy: float = 0.9999,
+                                  oversample: int = 10,
+                                  power_iter: int = 2,
+                                  block: int = 32,
+                                  seed: int = 0):
+    """
+    псевдообернена через рандомізований (усічений) SVD.
+
+    базис образу Q шукаємо за випадковою проєкцією Y = (A Aᵀ)^q A Ω,
+    далі SVD малої матриці B = Qᵀ A дає A ≈ U_r Σ_r V_rᵀ і
+      A⁺ ≈ V_r Σ_r⁻¹ U_rᵀ
+    ранг r — або заданий rank, або найменший, що зберігає частку energy
+    від ||A||_F² (тоді розмір проєкції подвоюється, поки частки не досягнуто:
+    Q лише доповнюється новими випадковими стовпцями, ортогональними до вже
+    знайдених, а B = Qᵀ A — їхніми рядками, без повтору попередньої роботи).
+    energy < 1 — це усічення: A⁺ лише наближена, і якщо відкинуті напрямки
+    потрібні задачі (як для зображень лабораторної), помилка помітно зростає;
+    energy = 1.0 — повний ранг.
+
+    повертає (A_plus, r): на місці iterations — використаний ранг
+    """
+    A = _as_float_matrix(A)
+    m, n = A.shape
+    full = min(m, n)
+    rng = np.random.default_rng(seed)
+    target = energy * float(np.vdot(A, A))
+
+    k = full if rank is None and energy >= 1.0 else min(rank or block, full)
+    Q = np.empty((m, 0), dtype=A.dtype)
+    B = np.empty((0, n), dtype=A.dtype)
+    while True:
+        l = min(k + oversample, full)
+        Omega = rng.standard_normal((n, l - Q.shape[1])).astype(A.dtype)
+        Q_new = _orthogonal_complement(Q, A @ Omega)
+        for _ in range(power_iter):
+            Q_new = np.linalg.qr(A.T @ Q_new)[0]
+            Q_new = _orthogonal_complement(Q, A @ Q_new)
+        Q = np.hstack([Q, Q_new])
+        B = np.vstack([B, Q_new.T @ A])
+
+        U_b, s, Vt = np.linalg.svd(B, full_matrices=False)
+        if rank is not None:
+            r = min(rank, s.size)
+            break
+        captured = np.cumsum(s.astype(np.float64) ** 2)
+        if captured[-1] >= target or l == full:
+            r = min(int(np.searchsorted(captured, target)) + 1, s.size)
+            break
+        k *= 2
+
+    # сингулярні числа на рівні шуму округлення не обертаємо
+    r = min(r, int(np.count_nonzero(s > s[0] * max(m, n) * np.finfo(A.dtype).eps)))
+    U = Q @ U_b[:, :r]
+    A_plus = (Vt[:r].T / s[:r]) @ U.T
+    return A_plus, r
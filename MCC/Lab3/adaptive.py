@@ -0,0 +1,108 @@
+# file: adaptive.py
+#
+# адаптивний метод Дормана-Принса 5(4) для лінійної системи dz/dt = M z
+# (стан або стан + чутливість, див. integrators.extended_matrix).
+# крок обирається за оцінкою локальної похибки (різниця розв'язків 5-го
+# і 4-го порядку) з допуском atol + rtol * |z|, тож на гладких ділянках
+# він може бути більшим за крок спостережень. значення в моментах times
+# береться з неперервного розширення (dense output) кроку, що їх накриває.
+# FSAL: остання стадія кроку — перша стадія наступного (6 обчислень M z на крок).
+
+import numpy as np
+
+A = [np.array(row) for row in (
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+)]
+B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# B - B̂ (порядок 4), для 7 стадій
+E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+# неперервне розширення: z(t + σh) = z + h * Kᵀ P [σ, σ², σ³, σ⁴]
+P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+def _error_norm(x: np.ndarray, scale: np.ndarray) -> float:
+    return np.sqrt(np.mean((x / scale) ** 2))
+
+
+def _initial_step(M, z0, f0, t_span, rtol, atol) -> float:
+    scale = atol + rtol * np.abs(z0)
+    d0 = _error_norm(z0, scale)
+    d1 = _error_norm(f0, scale)
+    h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    return min(h, t_span)
+
+
+def dopri_propagate(M: np.ndarray, z0: np.ndarray, times: np.ndarray,
+                    rtol: float = 1e-6, atol: float = 1e-9, h0=None,
+                    max_steps: int = 1_000_000):
+    """
+    z(t) для dz/dt = M z у моментах times (зростаючих, z(times[0]) = z0).
+    повертає (Z (N, d), stats), stats — словник steps, rejected, rhs_evals
+    """
+    times = np.asarray(times, dtype=float)
+    N = len(times)
+    Z = np.empty((N, z0.size))
+    Z[0] = z0
+    t, t_end = times[0], times[-1]
+    z = np.asarray(z0, dtype=float).copy()
+
+    K = np.empty((7, z.size))
+    K[0] = M @ z
+    rhs_evals = 1
+    h = _initial_step(M, z, K[0], t_end - t, rtol, atol) if h0 is None else h0
+    steps = rejected = 0
+    next_out = 1
+
+    while next_out < N:
+        if steps + rejected >= max_steps:
+            raise RuntimeError(f"dopri_propagate: перевищено {max_steps} кроків")
+        h = min(h, t_end - t)
+
+        for s in range(1, 6):
+            K[s] = M @ (z + h * (A[s] @ K[:s]))
+        z_new = z + h * (B @ K[:6])
+        K[6] = M @ z_new
+        rhs_evals += 6
+
+        scale = atol + rtol * np.maximum(np.abs(z), np.abs(z_new))
+        err = _error_norm(h * (E @ K), scale)
+
+        if err > 1.0:
+            rejected += 1
+            h *= max(MIN_FACTOR, SAFETY * err ** -0.2)
+            continue
+
+        # dense output у всіх моментах спостережень усередині (t, t + h]
+        t_new = t + h
+        stop = np.searchsorted(times, t_new, side="right")
+        if stop > next_out:
+            sigma = (times[next_out:stop] - t) / h
+            powers = np.cumprod(np.repeat(sigma[:, None], 4, axis=1), axis=1)
+            Q = K.T @ P                                 # (d, 4)
+            Z[next_out:stop] = z + h * powers @ Q.T
+            next_out = stop
+
+        steps += 1
+        t, z = t_new, z_new
+        K[0] = K[6]
+        factor = MAX_FACTOR if err == 0 else min(MAX_FACTOR, SAFETY * err ** -0.2)
+        h *= factor
+
+    return Z, {"steps": steps, "rejected": rejected, "rhs_evals": rhs_evals}
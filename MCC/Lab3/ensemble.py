@@ -0,0 +1,94 @@
+# file: ensemble.py
+#
+# ансамбль: K векторів параметрів інтегруються одночасно.
+# стан (K, 6) і чутливості (K, 6, P) зберігаються як один розширений стан
+# z (K, 6 * (P + 1)), крок RK4 — множення на матриці кроку S (K, d, d)
+# (див. integrators.py), тобто кожен крок — один пакетний matmul для всіх K.
+# по часу йде цикл лише з N кроків, історії не зберігаються: на кожному кроці
+# до втрати (і до JᵀJ, JᵀR) кожного члена ансамблю додається внесок цієї точки.
+
+import numpy as np
+
+from instrumentation import PROFILE
+from integrators import count_steps, extended_matrix, STEP_MATRICES
+
+
+def _step(S: np.ndarray, z: np.ndarray) -> np.ndarray:
+    return np.matmul(S, z[:, :, None])[:, :, 0]
+
+
+@PROFILE.timed("ensemble")
+def ensemble_loss(A: np.ndarray, Y_obs: np.ndarray, Y0: np.ndarray, h: float,
+                  method: str = "rk4") -> np.ndarray:
+    """
+    втрата Σ_t ||y_obs(t) - y_k(t)||² для кожної з K матриць A (K, 6, 6).
+    Y_obs (6, N), Y0 (6) — спільний початковий стан. повертає (K,)
+    """
+    S = STEP_MATRICES[method](A, h)
+    K, n = len(A), A.shape[-1]
+    count_steps(Y_obs.shape[1] - 1, K)
+    PROFILE.count("matmuls", (Y_obs.shape[1] - 1) * K)
+    Y = np.broadcast_to(np.asarray(Y0, dtype=float), (K, n)).copy()
+    loss = np.sum((Y_obs[:, 0] - Y) ** 2, axis=1)
+    for t in range(1, Y_obs.shape[1]):
+        Y = _step(S, Y)
+        loss += np.sum((Y_obs[:, t] - Y) ** 2, axis=1)
+    return loss
+
+
+@PROFILE.timed("ensemble")
+def ensemble_normal_equations(A: np.ndarray, D: np.ndarray, Y_obs: np.ndarray,
+                              Y0: np.ndarray, h: float, method: str = "rk4"):
+    """
+    для A (K, 6, 6), D (K, P, 6, 6): втрата (K,), JᵀJ (K, P, P) та JᵀR (K, P),
+    стан (K, 6) і чутливості (K, 6, P) рухаються разом в одному z
+    """
+    S = STEP_MATRICES[method](extended_matrix(A, D), h)
+    K, P, n = len(A), D.shape[1], A.shape[-1]
+    count_steps(Y_obs.shape[1] - 1, K)
+    PROFILE.count("matmuls", (Y_obs.shape[1] - 1) * K)
+    z = np.zeros((K, n * (P + 1)))
+    z[:, :n] = Y0
+
+    loss = np.zeros(K)
+    JtJ = np.zeros((K, P, P))
+    JtR = np.zeros((K, P))
+    for t in range(Y_obs.shape[1]):
+        if t:
+            z = _step(S, z)
+        R = Y_obs[:, t] - z[:, :n]                      # (K, 6)
+        U = z[:, n:].reshape(K, P, n).transpose(0, 2, 1)  # (K, 6, P)
+        loss += np.sum(R**2, axis=1)
+        JtJ += np.einsum("kvp,kvq->kpq", U, U)
+        JtR += np.einsum("kvp,kv->kp", U, R)
+    return loss, JtJ, JtR
+
+
+def loss_surface(model, Y_obs: np.ndarray, times: np.ndarray, center,
+                 axes=(0, 1), values=None, n: int = 100, span: float = 0.5,
+                 batch: int = 4096, method: str = "rk4"):
+    """
+    втрата на сітці n x n по двох невідомих model.unknown[axes[0]], [axes[1]],
+    решта невідомих — як у center. values — пара масивів значень осей,
+    за замовчуванням center * (1 ± span).
+    повертає (v1, v2, L), L[i, j] — втрата при (v1[i], v2[j]).
+    члени ансамблю обробляються пачками по batch
+    """
+    center = np.asarray(center, dtype=float)
+    i, j = axes
+    if values is None:
+        values = [np.linspace(center[a] * (1 - span), center[a] * (1 + span), n)
+                  for a in axes]
+    v1, v2 = (np.asarray(v, dtype=float) for v in values)
+
+    grid = np.tile(center, (v1.size * v2.size, 1))
+    grid[:, i] = np.repeat(v1, v2.size)
+    grid[:, j] = np.tile(v2, v1.size)
+
+    h = times[1] - times[0]
+    Y0 = Y_obs[:, 0]
+    L = np.empty(len(grid))
+    for start in range(0, len(grid), batch):
+        A, _ = model.matrices_batch(grid[start:start + batch])
+        L[start:start + batch] = ensemble_loss(A, Y_obs, Y0, h, method)
+    return v1, v2, L.reshape(v1.size, v2.size)
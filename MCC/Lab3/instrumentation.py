@@ -0,0 +1,139 @@
+# file: instrumentation.py
+#
+# вбудовані заміри для ідентифікації: час і кількість викликів по фазах
+# (пряма задача, збирання JᵀJ/JᵀR, lstsq, пробні кроки, графіки, ...),
+# лічильники (кроки інтегрування, добутки матриць для rk4/expm, обчислення
+# правої частини M z для dopri, розв'язані задачі) та пікова пам'ять.
+# звіт — словник / JSON.
+#
+# фази можуть бути вкладеними: для кожної рахується повний час (time)
+# і власний (self) — без часу вкладених фаз, тож сума self = час у фазах.
+# поки інструментування вимкнене (за замовчуванням), phase/count майже
+# нічого не коштують.
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import resource
+except ImportError:                      # Windows
+    resource = None
+
+
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.phases = {}                 # name -> [calls, time, self]
+        self.counters = {}
+        self._stack = []                 # [name, start, time у вкладених]
+        self._started = None
+
+    def start(self, trace_memory: bool = True) -> None:
+        """
+        вмикає заміри; trace_memory — пікова пам'ять через tracemalloc
+        (NumPy повідомляє про свої масиви, але заміри стають повільнішими)
+        """
+        self.reset()
+        self.enabled = True
+        self._started = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        self.enabled = False
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            entry = self.phases.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - frame[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def timed(self, name: str):
+        """
+        декоратор: кожен виклик функції — фаза name
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def report(self) -> dict:
+        memory = {}
+        if tracemalloc.is_tracing():
+            memory["traced_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        if resource is not None:
+            # ru_maxrss у кілобайтах (Linux)
+            memory["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        wall = time.perf_counter() - self._started if self._started is not None else 0.0
+        return {
+            "wall_time": wall,
+            "phases": {
+                name: {"calls": calls, "time": total, "self": own}
+                for name, (calls, total, own) in sorted(
+                    self.phases.items(), key=lambda item: -item[1][2])
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "memory": memory,
+        }
+
+    def write_json(self, path: str) -> dict:
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+        return report
+
+    def print_report(self, report=None) -> None:
+        report = report or self.report()
+        print(f"\n--- Заміри: {report['wall_time']:.3f} с ---")
+        print(f"{'фаза':<18} | {'викл.':>6} | {'час, с':>9} | {'власний, с':>10}")
+        print("-" * 52)
+        for name, p in report["phases"].items():
+            print(f"{name:<18} | {p['calls']:>6} | {p['time']:>9.4f} | {p['self']:>10.4f}")
+        for name, value in report["counters"].items():
+            print(f"  {name}: {value}")
+        for name, value in report["memory"].items():
+            print(f"  {name}: {value / 2**20:.1f} MiB")
+
+
+# спільний екземпляр для всіх модулів лабораторної
+PROFILE = Instrumentation()
+
+
+def untraced(target, *args):
+    """
+    запуск target(*args) у дочірньому процесі (напр., графіка у фоні):
+    успадковані від батька tracemalloc і заміри вимикаються, бо лише
+    сповільнюють дочірній процес, а його звіт нікуди не потрапляє
+    """
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    PROFILE.stop()
+    return target(*args)
@@ -0,0 +1,170 @@
+# file: integrators.py
+#
+# інтегрування лінійної системи dY/dt = A Y разом з чутливостями
+# dU_j/dt = A U_j + D_j Y  (D_j = ∂A/∂β_j).
+#
+# розширений стан z = [Y; U_1; ...; U_P] теж задовольняє лінійне рівняння
+# dz/dt = M z, тому крок будь-якого методу — це множення на сталу матрицю S:
+#   RK4:  S = I + hM + (hM)²/2 + (hM)³/6 + (hM)⁴/24   (рівно те, що дає RK4)
+#   expm: S = exp(hM)                                (точний розв'язок)
+# S будується один раз на вектор параметрів, після чого вся траєкторія
+# z_k = S^k z_0 рахується подвоєнням: log2(N) множень матриць замість N кроків.
+#
+# method="dopri" — адаптивний Дорман-Принс 5(4) з контролем похибки
+# (rtol, atol) і dense output у моментах times (див. adaptive.py).
+
+import numpy as np
+
+from adaptive import dopri_propagate
+from instrumentation import PROFILE
+
+
+def extended_matrix(A: np.ndarray, D: np.ndarray) -> np.ndarray:
+    """
+    матриця M розширеної системи для z = [Y; U_1; ...; U_P]:
+        M = [ A            ]
+            [ D_1  A       ]
+            [ ...     ...  ]
+            [ D_P        A ]
+    для ансамблю A (K, n, n), D (K, P, n, n) -> M (K, d, d)
+    """
+    n = A.shape[-1]
+    P = D.shape[-3]
+    M = np.zeros(A.shape[:-2] + (n * (P + 1), n * (P + 1)))
+    for j in range(P + 1):
+        M[..., j * n:(j + 1) * n, j * n:(j + 1) * n] = A
+    for j in range(P):
+        M[..., (j + 1) * n:(j + 2) * n, :n] = D[..., j, :, :]
+    return M
+
+
+def rk4_step_matrix(M: np.ndarray, h: float) -> np.ndarray:
+    """
+    оператор одного кроку RK4 для dz/dt = M z (схема Горнера),
+    M може мати ведучу вісь ансамблю (K, d, d)
+    """
+    X = h * M
+    I = np.eye(M.shape[-1])
+    PROFILE.count("matmuls", 3 * (M.size // M.shape[-1] ** 2))
+    return I + X @ (I + X @ (I + X @ (I + X / 4.0) / 3.0) / 2.0)
+
+
+def expm_step_matrix(M: np.ndarray, h: float) -> np.ndarray:
+    """
+    точний оператор кроку exp(hM)
+    """
+    from scipy.linalg import expm
+
+    return expm(h * M)
+
+
+STEP_MATRICES = {
+    "rk4": rk4_step_matrix,
+    "expm": expm_step_matrix,
+}
+
+
+def propagate(S: np.ndarray, z0: np.ndarray, N: int) -> np.ndarray:
+    """
+    траєкторія z_k = S^k z_0, k = 0..N-1, у вигляді масиву (N, d).
+    блок уже пораханих станів множиться на S^f (f — їх кількість),
+    а S^f щоразу підноситься до квадрату
+    """
+    Z = np.empty((N, z0.size))
+    Z[0] = z0
+    St = S.T                    # рядки Z: z_{k+f}ᵀ = z_kᵀ (S^f)ᵀ
+    filled = 1
+    while filled < N:
+        take = min(filled, N - filled)
+        np.matmul(Z[:take], St, out=Z[filled:filled + take])
+        PROFILE.count("matmuls")
+        filled += take
+        if filled < N:
+            St = St @ St
+            PROFILE.count("matmuls")
+    return Z
+
+
+def count_steps(steps: int, width: int = 1) -> None:
+    """
+    лічильник кроків для instrumentation; width — кількість траєкторій (ансамбль).
+    rk4 та expm правої частини M z окремо не обчислюють: їхню роботу
+    показує лічильник matmuls — добутки матриць при побудові S та
+    підстановці траєкторії (пакетний добуток ансамблю K — K добутків).
+    rhs_evals рахує лише dopri
+    """
+    PROFILE.count("steps", steps * width)
+
+
+def _propagate_on(M: np.ndarray, z0: np.ndarray, times: np.ndarray, method: str,
+                  rtol: float, atol: float) -> np.ndarray:
+    with PROFILE.phase("integrate"):
+        if method == "dopri":
+            Z, stats = dopri_propagate(M, z0, times, rtol, atol)
+            PROFILE.count("steps", stats["steps"])
+            PROFILE.count("rejected_steps", stats["rejected"])
+            PROFILE.count("rhs_evals", stats["rhs_evals"])
+            return Z
+        S = STEP_MATRICES[method](M, times[1] - times[0])
+        count_steps(len(times) - 1)
+        return propagate(S, z0, len(times))
+
+
+def solve_linear_sensitivity(A: np.ndarray, D: np.ndarray, Y0: np.ndarray,
+                             times: np.ndarray, method: str = "rk4",
+                             rtol: float = 1e-6, atol: float = 1e-9):
+    """
+    Y (n, N) та U (n, P, N) на сітці times, U(t0) = 0.
+    rk4/expm — рівномірна сітка, dopri — будь-яка зростаюча, з допуском rtol, atol
+    """
+    n = A.shape[0]
+    P = len(D)
+    N = len(times)
+
+    z0 = np.zeros(n * (P + 1))
+    z0[:n] = Y0
+    Z = _propagate_on(extended_matrix(A, D), z0, times, method, rtol, atol)
+
+    Y_history = Z[:, :n].T
+    U_history = Z[:, n:].reshape(N, P, n).transpose(2, 1, 0)
+    return Y_history, U_history
+
+
+def solve_linear(A: np.ndarray, Y0: np.ndarray, times: np.ndarray,
+                 method: str = "rk4", rtol: float = 1e-6,
+                 atol: float = 1e-9) -> np.ndarray:
+    """
+    лише траєкторія Y (n, N), без чутливостей — для пробних кроків,
+    де потрібна тільки втрата
+    """
+    return _propagate_on(A, np.asarray(Y0, dtype=float), times, method, rtol, atol).T
+
+
+def step_matrix(A: np.ndarray, D, h: float, method: str = "rk4") -> np.ndarray:
+    """
+    S для стану (D=None) або для розширеної системи стан + чутливість
+    """
+    M = A if D is None else extended_matrix(A, D)
+    return STEP_MATRICES[method](M, h)
+
+
+def propagate_chunks(S: np.ndarray, z0: np.ndarray, N: int, chunk: int = 4096):
+    """
+    та сама траєкторія, що й propagate, але блоками (k, d), k <= chunk,
+    без масиву на всі N станів. перший блок — подвоєнням, кожен наступний —
+    одним множенням попереднього на (S^chunk)ᵀ
+    """
+    block = propagate(S, z0, min(chunk, N))
+    yield block
+    done = len(block)
+    if done >= N:
+        return
+    Sct = np.linalg.matrix_power(S, chunk).T
+    # піднесення до степеня — квадрати та множення на S за двійковим записом chunk
+    PROFILE.count("matmuls", chunk.bit_length() + bin(chunk).count("1") - 2)
+    while done < N:
+        block = block @ Sct
+        PROFILE.count("matmuls")
+        take = min(chunk, N - done)
+        yield block[:take]
+        done += take
@@ -1,6 +1,13 @@
 # file: lab3_variant3.py
+import multiprocessing
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+from instrumentation import PROFILE, untraced
+from integrators import solve_linear, solve_linear_sensitivity
+from model import MassSpringModel
+from objective import InMemoryObjective, StreamingObjective
+from observations import load_observations
 
 # ==========================================
 # ВАРІАНТ №3 (згідно з вашими скріншотами)
@@ -18,289 +25,526 @@ c4_known = 0.12
 m2_known = 28.0
 m3_known = 18.0
 
+# Відомі параметри за іменами та невідомі, які шукаємо (будь-яка підмножина
+# {c1..c4, m1..m3}, див. model.py); решта мають бути серед відомих
+KNOWN_PARAMS = {"c2": c2_known, "c4": c4_known, "m2": m2_known, "m3": m3_known}
+UNKNOWN_PARAMS = ("c1", "c3", "m1")
+
+MODEL = MassSpringModel(UNKNOWN_PARAMS, KNOWN_PARAMS)
+
 # ПОЧАТКОВЕ НАБЛИЖЕННЯ для невідомих параметрів
 # Ми шукаємо вектор beta = [c1, c3, m1]
 # Початкове наближення beta0 = [0.1, 0.1, 9.0]
-initial_guess = np.array([0.1, 0.1, 9.0]) 
+initial_guess = MODEL.initial_guess
+
+# Межі для випадкових початкових наближень у мультистарті: [min, max] для c1, c3, m1
+PARAM_BOUNDS = MODEL.bounds
 
 # ==========================================
 # МОДЕЛЬ ТА ЧУТЛИВІСТЬ
 # ==========================================
 
-def get_derivatives(t, Y, params):
+def get_system_matrices(params):
     """
-    Y = [x1, v1, x2, v2, x3, v3]
-    params = [c1, c3, m1] (невідомі)
+    система лінійна: dY/dt = A Y, Y = [x1, v1, x2, v2, x3, v3]
+    params = [c1, c3, m1] (невідомі MODEL)
+
+    повертає A = df/dY (6x6) та D (3, 6, 6), D[j] = ∂A/∂beta_j,
+    тоді матриця B = df/d_beta рівна [D_1 Y, D_2 Y, D_3 Y]
     """
-    x1, v1, x2, v2, x3, v3 = Y
-    c1, c3, m1 = params
-    
-    # Використовуємо відомі параметри
-    c2 = c2_known
-    c4 = c4_known
-    m2 = m2_known
-    m3 = m3_known
-    
-    # Рівняння руху для системи з 3 мас та 4 пружин:
-    # m1*a1 = -c1*x1 + c2*(x2 - x1)  => -(c1+c2)x1 + c2*x2
-    # m2*a2 = -c2*(x2 - x1) + c3*(x3 - x2) => c2*x1 - (c2+c3)x2 + c3*x3
-    # m3*a3 = -c3*(x3 - x2) - c4*x3  => c3*x2 - (c3+c4)x3
-    
-    dx1 = v1
-    dv1 = (-(c1 + c2) * x1 + c2 * x2) / m1
-    
-    dx2 = v2
-    dv2 = (c2 * x1 - (c2 + c3) * x2 + c3 * x3) / m2
-    
-    dx3 = v3
-    dv3 = (c3 * x2 - (c3 + c4) * x3) / m3
-    
-    return np.array([dx1, dv1, dx2, dv2, dx3, dv3])
+    return MODEL.matrices(params)
 
-def get_sensitivity_derivatives(t, Y, U, params):
+# ==========================================
+# ЧИСЕЛЬНІ МЕТОДИ (Рунге-Кутта 4 / exp(hM))
+# ==========================================
+
+def solve_system_and_sensitivity(Y0, params, times, method="rk4"):
     """
-    U - матриця чутливості розміру (6, 3).
-    Стовпці відповідають параметрам: [c1, c3, m1]
+    траєкторія Y (6, N) та чутливості U (6, 3, N) на рівномірній сітці times.
+
+    розширена система (стан + чутливість) лінійна, тож матриця кроку RK4
+    (або точна exp(hM) при method="expm") будується один раз на вектор
+    параметрів, а не для кожної стадії кожного кроку (див. integrators.py)
     """
-    x1, v1, x2, v2, x3, v3 = Y
-    c1, c3, m1 = params
-    
-    c2 = c2_known
-    c4 = c4_known
-    m2 = m2_known
-    m3 = m3_known
-    
-    # --- Матриця A = df/dY (6x6) ---
-    A = np.zeros((6, 6))
-    
-    # dx1/dt = v1
-    A[0, 1] = 1.0
-    
-    # dv1/dt = (-(c1+c2)x1 + c2*x2) / m1
-    A[1, 0] = -(c1 + c2) / m1  # d(dv1)/dx1
-    A[1, 2] = c2 / m1          # d(dv1)/dx2
-    
-    # dx2/dt = v2
-    A[2, 3] = 1.0
-    
-    # dv2/dt = (c2*x1 - (c2+c3)x2 + c3*x3) / m2
-    A[3, 0] = c2 / m2          # d(dv2)/dx1
-    A[3, 2] = -(c2 + c3) / m2  # d(dv2)/dx2
-    A[3, 4] = c3 / m2          # d(dv2)/dx3
-    
-    # dx3/dt = v3
-    A[4, 5] = 1.0
-    
-    # dv3/dt = (c3*x2 - (c3+c4)x3) / m3
-    A[5, 2] = c3 / m3          # d(dv3)/dx2
-    A[5, 4] = -(c3 + c4) / m3  # d(dv3)/dx3
-    
-    # --- Матриця B = df/d_beta (6x3) ---
-    # beta = [c1, c3, m1]
-    B = np.zeros((6, 3))
-    
-    # 1. Похідні по c1 (тільки в рівнянні для v1)
-    # dv1/dc1 = (-x1)/m1
-    B[1, 0] = -x1 / m1
-    
-    # 2. Похідні по c3 (в рівняннях для v2 та v3)
-    # dv2/dc3 = (-x2 + x3)/m2
-    B[3, 1] = (x3 - x2) / m2
-    # dv3/dc3 = (x2 - x3)/m3
-    B[5, 1] = (x2 - x3) / m3
-    
-    # 3. Похідні по m1 (тільки в рівнянні для v1)
-    # dv1/dm1 = - (Force1) / m1^2
-    force1 = (-(c1 + c2) * x1 + c2 * x2)
-    B[1, 2] = -force1 / (m1**2)
-    
-    # Рівняння чутливості: dU/dt = A*U + B
-    dU_dt = A @ U + B
-    return dU_dt
+    A, D = get_system_matrices(params)
+    return solve_linear_sensitivity(A, D, Y0, times, method)
+
+
+def solve_system(Y0, params, times, method="rk4"):
+    """
+    лише траєкторія Y (6, N) — без 18 рівнянь чутливості
+    """
+    A, _ = get_system_matrices(params)
+    return solve_linear(A, Y0, times, method)
 
 # ==========================================
-# ЧИСЕЛЬНІ МЕТОДИ (Рунге-Кутта 4)
+# ІДЕНТИФІКАЦІЯ (Гаусс-Ньютон)
 # ==========================================
 
-def solve_system_and_sensitivity(Y0, params, times):
-    N = len(times)
-    h = times[1] - times[0]
-    num_vars = len(Y0)
-    num_params = len(params)
-    
-    Y_history = np.zeros((num_vars, N))
-    U_history = np.zeros((num_vars, num_params, N))
-    
-    Y_curr = Y0.copy()
-    U_curr = np.zeros((num_vars, num_params))
-    
-    Y_history[:, 0] = Y_curr
-    U_history[:, :, 0] = U_curr
-    
-    # Функція для розширеної системи (стан + чутливість)
-    def extended_system(t_ext, State_ext, p_ext):
-        # State_ext: перші 6 елементів - Y, наступні 18 - U (6x3 розгорнуті)
-        y_local = State_ext[:6]
-        u_local = State_ext[6:].reshape(6, num_params)
-        
-        dy = get_derivatives(t_ext, y_local, p_ext)
-        du = get_sensitivity_derivatives(t_ext, y_local, u_local, p_ext)
-        
-        return np.concatenate([dy, du.flatten()])
+def gauss_newton(Y_obs, Y0, params, times, max_iter=50, tol=1e-5,
+                 verbose=True, should_stop=None, stats=None, objective=None):
+    """
+    ітерації Гаусса-Ньютона від початкового наближення params.
+    should_stop(iteration, loss) -> True перериває пошук (напр., коли
+    цей старт явно гірший за найкращий у мультистарті).
+    stats — необов'язковий словник, куди записуються лічильники
+    iterations, full_solves (стан + чутливість) та trial_solves (лише стан).
+    objective — готовий функціонал (див. objective.py), напр. StreamingObjective;
+    тоді Y_obs, Y0 та times не використовуються і можуть бути None.
 
-    for i in range(N - 1):
-        t = times[i]
-        
-        State_curr = np.concatenate([Y_curr, U_curr.flatten()])
+    повертає (params, loss_history, status), status — причина зупинки:
+    "tol", "step", "linalg", "diverged", "cut", "max_iter" або (лише
+    levenberg_marquardt) "lambda" — жоден пробний крок не зменшив втрату
+    аж до lam_max
+    """
+    if objective is None:
+        objective = InMemoryObjective(Y_obs, Y0, times, get_system_matrices)
+    params = np.asarray(params, dtype=float).copy()
+    loss_history = []
+    status = "max_iter"
+    full_solves = 0
+    
+    for iteration in range(max_iter):
+        # Пряма задача: функціонал якості (сума квадратів нев'язок)
+        # та нормальні рівняння МНК JᵀJ delta = JᵀR (без самої J)
+        with PROFILE.phase("forward"):
+            loss, JtJ, JtR = objective.full(params)
+        full_solves += 1
+        PROFILE.count("full_solves")
+        loss_history.append(loss)
         
-        k1 = extended_system(t, State_curr, params)
-        k2 = extended_system(t + 0.5*h, State_curr + 0.5*h*k1, params)
-        k3 = extended_system(t + 0.5*h, State_curr + 0.5*h*k2, params)
-        k4 = extended_system(t + h, State_curr + h*k3, params)
+        if verbose:
+            print(f"Iter {iteration+1:2d}: Loss = {loss:.6f}, Params = {params}")
         
-        State_next = State_curr + (h/6.0)*(k1 + 2*k2 + 2*k3 + k4)
+        if not np.isfinite(loss):
+            status = "diverged"
+            if verbose:
+                print("  Розбіжність (нескінченна втрата).")
+            break
         
-        Y_next = State_next[:6]
-        U_next = State_next[6:].reshape(6, num_params)
+        if loss < tol:
+            status = "tol"
+            if verbose:
+                print("  Збіжність досягнута (tolerance).")
+            break
         
-        Y_history[:, i+1] = Y_next
-        U_history[:, :, i+1] = U_next
+        if should_stop is not None and should_stop(iteration, loss):
+            status = "cut"
+            break
         
-        Y_curr = Y_next
-        U_curr = U_next
+        # Крок методу: delta = (J.T J)^-1 J.T R
+        try:
+            with PROFILE.phase("lstsq"):
+                delta_p, _, _, _ = np.linalg.lstsq(JtJ, JtR, rcond=None)
+        except np.linalg.LinAlgError:
+            status = "linalg"
+            if verbose:
+                print("  Помилка лінійної алгебри (сингулярність).")
+            break
+            
+        params = params + delta_p
         
-    return Y_history, U_history
+        # Перевірка на малість кроку
+        if np.linalg.norm(delta_p) < 1e-6:
+            status = "step"
+            if verbose:
+                print("  Зміна параметрів замала. Зупинка.")
+            break
+    
+    if stats is not None:
+        stats.update(iterations=len(loss_history), full_solves=full_solves, trial_solves=0)
+    return params, loss_history, status
 
-# ==========================================
-# ГОЛОВНА ФУНКЦІЯ
-# ==========================================
 
-def main():
-    print(f"--- Лабораторна робота №3: Варіант 3 ---")
-    
-    # 1. Завантаження даних
-    try:
-        data = np.loadtxt(DATA_FILE)
-        # Перевіряємо орієнтацію даних
-        if data.shape[0] == 6 and data.shape[1] > 6:
-            Y_obs = data
-        else:
-            Y_obs = data.T
-            
-        N_points = Y_obs.shape[1]
-        print(f"  Дані завантажено: {N_points} точок, {Y_obs.shape[0]} змінних.")
-    except Exception as e:
-        print(f"Помилка завантаження {DATA_FILE}: {e}")
-        return
+def levenberg_marquardt(Y_obs, Y0, params, times, max_iter=50, tol=1e-5,
+                        lam=1e-3, lam_up=10.0, lam_down=10.0, lam_max=1e10,
+                        verbose=True, should_stop=None, stats=None, objective=None):
+    """
+    метод Левенберга-Марквардта з адаптивним демпфуванням:
+      (JᵀJ + λ diag(JᵀJ)) δ = JᵀR
 
-    # 2. Часова сітка (0..50)
-    times = np.linspace(T_START, T_END, N_points)
-    dt = times[1] - times[0]
-    print(f"  Час: {T_START}..{T_END}, крок dt = {dt:.4f}")
-    
-    # 3. Початкові умови (з файлу)
-    Y0 = Y_obs[:, 0]
-    
-    # 4. Ідентифікація
-    params = initial_guess.copy()
-    max_iter = 50
-    tol = 1e-5
-    
-    print("\n--- Старт ідентифікації (Гаусс-Ньютон) ---")
-    print(f"  Відомі: c2={c2_known}, c4={c4_known}, m2={m2_known}, m3={m3_known}")
-    print(f"  Шукаємо: [c1, c3, m1]")
-    print(f"  Початкове наближення: {params}\n")
-    
+    перший пробний крок ітерації оцінюється повною задачею (objective.full):
+    зазвичай його приймають, і готові втрата, JᵀJ та JᵀR переходять
+    у наступну ітерацію без повторного розв'язання. якщо втрата не
+    зменшилась, λ збільшується, δ перераховується з тих самих JᵀJ, JᵀR,
+    а наступні спроби оцінюються лише прямою задачею для стану
+    (objective.loss, 6 рівнянь замість 24). після прийнятого кроку
+    λ зменшується.
+
+    контракт той самий, що й у gauss_newton: (params, loss_history, status),
+    плюс статус "lambda" (див. gauss_newton)
+    """
+    if objective is None:
+        objective = InMemoryObjective(Y_obs, Y0, times, get_system_matrices)
+    params = np.asarray(params, dtype=float).copy()
     loss_history = []
+    status = "max_iter"
+    full_solves = 0
+    trial_solves = 0
+    evaluated = None    # (loss, JtJ, JtR) для params, якщо їх дав пробний крок
     
     for iteration in range(max_iter):
-        # Пряма задача
-        Y_model, U_model = solve_system_and_sensitivity(Y0, params, times)
-        
-        # Вектор нев'язки R (всі точки в один вектор)
-        Residuals = (Y_obs - Y_model)
-        R_vec = Residuals.flatten()
-        
-        # Функціонал якості (сума квадратів)
-        loss = np.sum(R_vec**2)
+        # Пряма задача зі чутливістю — лише якщо прийнятий крок її не дав
+        if evaluated is None:
+            with PROFILE.phase("forward"):
+                evaluated = objective.full(params)
+            full_solves += 1
+            PROFILE.count("full_solves")
+        loss, JtJ, JtR = evaluated
+        evaluated = None
         loss_history.append(loss)
         
-        print(f"Iter {iteration+1:2d}: Loss = {loss:.6f}, Params = {params}")
+        if verbose:
+            print(f"Iter {iteration+1:2d}: Loss = {loss:.6f}, Params = {params}, lambda = {lam:.1e}")
+        
+        if not np.isfinite(loss):
+            status = "diverged"
+            if verbose:
+                print("  Розбіжність (нескінченна втрата).")
+            break
         
         if loss < tol:
-            print("  Збіжність досягнута (tolerance).")
+            status = "tol"
+            if verbose:
+                print("  Збіжність досягнута (tolerance).")
             break
-            
-        # Матриця Якобі J (для МНК)
-        # Розміри: (6*N_points, 3_params)
-        J = np.zeros((6 * N_points, 3))
         
-        # Заповнюємо J з матриці чутливості U
-        # R_vec сформовано як [y1(t0)..y1(tk), y2(t0)..y2(tk)...] якщо flatten() row-major для (6,N)
-        # (6, N) -> flatten -> 0-й рядок, 1-й рядок...
+        if should_stop is not None and should_stop(iteration, loss):
+            status = "cut"
+            break
         
-        # Тому J має бути структуровано так само
-        for v in range(6): # по змінних
-            for p in range(3): # по параметрах
-                # v-й рядок U[:, p, :] - це похідні v-ї змінної по p-му параметру в усі моменти часу
-                start_idx = v * N_points
-                end_idx = (v + 1) * N_points
-                J[start_idx:end_idx, p] = U_model[v, p, :]
+        diag = np.diag(np.diag(JtJ))
         
-        # Крок методу: delta = (J.T J)^-1 J.T R
-        try:
-            delta_p, _, _, _ = np.linalg.lstsq(J, R_vec, rcond=None)
-        except np.linalg.LinAlgError:
-            print("  Помилка лінійної алгебри (сингулярність).")
-            break
+        # Пробні кроки з тими самими JᵀJ, JᵀR; перший — повною задачею
+        accepted = False
+        first_trial = True
+        while lam <= lam_max:
+            try:
+                with PROFILE.phase("lstsq"):
+                    delta_p = np.linalg.solve(JtJ + lam * diag, JtR)
+            except np.linalg.LinAlgError:
+                lam *= lam_up
+                continue
             
-        params = params + delta_p
+            trial = params + delta_p
+            candidate = None
+            if first_trial:
+                with PROFILE.phase("forward"):
+                    candidate = objective.full(trial)
+                trial_loss = candidate[0]
+                full_solves += 1
+                PROFILE.count("full_solves")
+                first_trial = False
+            else:
+                with PROFILE.phase("trial"):
+                    trial_loss = objective.loss(trial)
+                trial_solves += 1
+                PROFILE.count("trial_solves")
+            
+            if np.isfinite(trial_loss) and trial_loss < loss:
+                accepted = True
+                params = trial
+                evaluated = candidate
+                lam = max(lam / lam_down, 1e-12)
+                break
+            lam *= lam_up
+        
+        if not accepted:
+            status = "lambda"
+            if verbose:
+                print("  Крок не знайдено (lambda занадто велике). Зупинка.")
+            break
         
         # Перевірка на малість кроку
         if np.linalg.norm(delta_p) < 1e-6:
-            print("  Зміна параметрів замала. Зупинка.")
+            status = "step"
+            if verbose:
+                print("  Зміна параметрів замала. Зупинка.")
             break
-            
-    print("\n===========================================")
-    print(f"ЗНАЙДЕНІ ПАРАМЕТРИ:")
-    print(f"  c1 = {params[0]:.6f}")
-    print(f"  c3 = {params[1]:.6f}")
-    print(f"  m1 = {params[2]:.6f}")
-    print("===========================================")
-    
-    # 5. Результати та графіки
-    Y_final, _ = solve_system_and_sensitivity(Y0, params, times)
     
+    if stats is not None:
+        stats.update(iterations=len(loss_history), full_solves=full_solves,
+                     trial_solves=trial_solves)
+    return params, loss_history, status
+
+# ==========================================
+# ГРАФІКИ
+# ==========================================
+
+def _pyplot(headless=False):
+    """
+    matplotlib імпортується лише тут; headless — бекенд Agg (без GUI)
+    """
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def plot_results(times, Y_obs, Y_final, loss_history, headless=False):
+    plt = _pyplot(headless)
+
     plt.figure(figsize=(14, 6))
-    
+
     plt.subplot(1, 2, 1)
     # Відобразимо координати x1, x2, x3
     plt.plot(times, Y_obs[0, :], 'r.', markersize=2, label='Obs x1')
     plt.plot(times, Y_final[0, :], 'r-', linewidth=1, label='Mod x1')
-    
+
     plt.plot(times, Y_obs[2, :], 'g.', markersize=2, label='Obs x2')
     plt.plot(times, Y_final[2, :], 'g-', linewidth=1, label='Mod x2')
-    
+
     plt.plot(times, Y_obs[4, :], 'b.', markersize=2, label='Obs x3')
     plt.plot(times, Y_final[4, :], 'b-', linewidth=1, label='Mod x3')
-    
+
     plt.title("Порівняння моделі та експерименту")
     plt.xlabel("Час")
     plt.ylabel("Координати")
     plt.legend()
     plt.grid(True)
-    
+
     plt.subplot(1, 2, 2)
     plt.plot(loss_history, 'k-o')
     plt.yscale('log')
     plt.title("Функція втрат (Loss)")
     plt.xlabel("Ітерація")
     plt.grid(True)
-    
+
     plt.tight_layout()
     plt.savefig("lab3_v3_result.png")
     print("Графік збережено у lab3_v3_result.png")
-    plt.show()
+
+
+def plot_surface(v1, v2, L, params, names, headless=False):
+    plt = _pyplot(headless)
+
+    plt.figure(figsize=(7, 6))
+    plt.contourf(v2, v1, np.log10(L), levels=40)
+    plt.colorbar(label="log10(Loss)")
+    plt.plot(params[1], params[0], 'r*', markersize=12)
+    plt.xlabel(names[1])
+    plt.ylabel(names[0])
+    plt.title("Поверхня втрат")
+    plt.savefig("lab3_v3_surface.png")
+    print("Поверхню втрат збережено у lab3_v3_surface.png")
+
+# ==========================================
+# ГОЛОВНА ФУНКЦІЯ
+# ==========================================
+
+SOLVERS = {
+    "gn": gauss_newton,
+    "lm": levenberg_marquardt,
+}
+
+
+def identify(Y_obs, times, model=None, params0=None, solver="gn", **kwargs):
+    """
+    ідентифікація невідомих model.unknown (за замовчуванням MODEL) за
+    спостереженнями Y_obs (6, N), початковий стан Y0 = Y_obs[:, 0].
+    один процес може підбирати різні варіанти, змінюючи лише model:
+        identify(Y_obs, times, MassSpringModel(("c2", "m3"), known))
+    kwargs передаються методу (max_iter, tol, verbose, stats, ...).
+    повертає (params, loss_history, status)
+    """
+    model = MODEL if model is None else model
+    params0 = model.initial_guess if params0 is None else params0
+    Y0 = Y_obs[:, 0]
+    objective = InMemoryObjective(Y_obs, Y0, times, model)
+    return SOLVERS[solver](Y_obs, Y0, params0, times, objective=objective, **kwargs)
+
+
+def main(starts=None, workers=None, solver="gn", stream=False, chunk=4096,
+         unknown=None, known=None, surface=None, integrator="rk4", rtol=1e-6,
+         plots="show"):
+    print(f"--- Лабораторна робота №3: Варіант 3 ---")
+    
+    # Модель: за замовчуванням невідомі [c1, c3, m1], інакше — задані unknown,
+    # значення решти з KNOWN_PARAMS та known
+    if unknown:
+        try:
+            model = MassSpringModel(unknown, {**KNOWN_PARAMS, **(known or {})})
+        except ValueError as e:
+            print(f"Помилка моделі: {e}")
+            return
+    else:
+        model = MODEL
+    
+    # 1. Завантаження даних: текст розбирається блоками в будь-якій орієнтації
+    # (6 рядків по N або N рядків по 6) і кешується як DATA_FILE.npy
+    try:
+        with PROFILE.phase("load"):
+            obs = load_observations(DATA_FILE, chunk=chunk)     # (N, 6), memmap
+        N_points = len(obs)
+        print(f"  Дані завантажено: {N_points} точок, {obs.shape[1]} змінних.")
+    except Exception as e:
+        print(f"Помилка завантаження {DATA_FILE}: {e}")
+        return
+
+    # 2. Часова сітка (0..50)
+    times = np.linspace(T_START, T_END, N_points)
+    dt = times[1] - times[0]
+    print(f"  Час: {T_START}..{T_END}, крок dt = {dt:.4f}")
+    
+    # 3. Початкові умови (з файлу)
+    if stream:
+        # потоковий режим: повних історій Y_obs, Y_model, U_model немає,
+        # втрата та JᵀJ, JᵀR накопичуються блоками по chunk точок
+        try:
+            objective = StreamingObjective(obs, dt, model, chunk, integrator)
+        except ValueError as e:
+            print(f"Помилка: {e}")
+            return
+        Y_obs = None
+        Y0 = objective.Y0
+        print(f"  Потоковий режим: блоки по {chunk} точок")
+        if starts:
+            print("  Мультистарт у потоковому режимі не підтримується, один старт.")
+    else:
+        Y_obs = np.asarray(obs).T
+        Y0 = Y_obs[:, 0]
+        # dopri — адаптивний крок з допуском rtol (atol = rtol * 1e-3)
+        options = {"method": integrator, "rtol": rtol, "atol": rtol * 1e-3}
+        objective = InMemoryObjective(Y_obs, Y0, times, model, **options)
+    
+    # 4. Ідентифікація
+    params = initial_guess.copy() if model is MODEL else model.initial_guess
+    max_iter = 50
+    tol = 1e-5
+    
+    print(f"\n--- Старт ідентифікації ({'Левенберг-Марквардт' if solver == 'lm' else 'Гаусс-Ньютон'}) ---")
+    print("  Відомі: " + ", ".join(f"{p}={v}" for p, v in model.known.items()))
+    print(f"  Шукаємо: [{', '.join(model.unknown)}]")
+    print(f"  Початкове наближення: {params}\n")
+    
+    if starts and not stream:
+        # Мультистарт: багато початкових наближень паралельно
+        from multistart import run_multistart, print_multistart_report
+
+        # заміри всередині процесів пулу до звіту не потрапляють
+        with PROFILE.phase("multistart"):
+            best, stats = run_multistart(Y_obs, Y0, times, starts, workers=workers,
+                                         max_iter=max_iter, tol=tol, model=model,
+                                         options=options, solver=solver)
+        print_multistart_report(best, stats, model.unknown)
+        if best is None:
+            print("  Жоден старт не зійшовся.")
+            return
+        params = best["params"]
+        # історія втрат для графіка — з процесу найкращого старту, без повтору
+        loss_history = best["loss_history"]
+    else:
+        stats = {}
+        params, loss_history, _ = SOLVERS[solver](Y_obs, Y0, params, times, max_iter, tol,
+                                                  stats=stats, objective=objective)
+        print(f"  Ітерацій: {stats['iterations']}, прямих задач зі чутливістю: "
+              f"{stats['full_solves']}, пробних (лише стан): {stats['trial_solves']}")
+            
+    print("\n===========================================")
+    print(f"ЗНАЙДЕНІ ПАРАМЕТРИ:")
+    for name, value in zip(model.unknown, params):
+        print(f"  {name} = {value:.6f}")
+    print("===========================================")
+    
+    if stream:
+        # графік потребував би всієї траєкторії — у потоковому режимі лише втрата
+        print(f"  Loss = {loss_history[-1]:.6e}")
+        return
+    
+    # 5. Результати та графіки
+    # plots="none" — matplotlib не імпортується зовсім (поверхня втрат
+    # рахується й друкується без графіка); "headless" — кожен графік малює
+    # окремий процес (Agg), поки головний рахує далі
+    workers = []
+
+    def render(plot, *plot_args):
+        if plots == "headless":
+            worker = multiprocessing.Process(target=untraced,
+                                             args=(plot,) + plot_args + (True,))
+            worker.start()
+            workers.append(worker)
+        else:
+            with PROFILE.phase("plot"):
+                plot(*plot_args)
+
+    if plots != "none":
+        Y_final = solve_linear(model.matrices(params)[0], Y0, times, **options)
+        render(plot_results, times, Y_obs, Y_final, loss_history)
+
+    if surface and model.n_params >= 2:
+        # Поверхня втрат по перших двох невідомих навколо знайденого розв'язку:
+        # surface x surface векторів параметрів інтегруються ансамблем
+        from ensemble import loss_surface
+
+        with PROFILE.phase("surface"):
+            v1, v2, L = loss_surface(model, Y_obs, times, params, n=surface)
+        i, j = np.unravel_index(np.argmin(L), L.shape)
+        print(f"Поверхня втрат {surface}x{surface}: мінімум {L[i, j]:.6e} при "
+              f"{model.unknown[0]} = {v1[i]:.6f}, {model.unknown[1]} = {v2[j]:.6f}")
+        if plots != "none":
+            render(plot_surface, v1, v2, L, params, model.unknown)
+
+    # очікування фонових процесів — окрема фаза, щоб не змішувати її з розрахунком
+    if workers:
+        with PROFILE.phase("plot_join"):
+            for worker in workers:
+                worker.join()
+    if plots == "show":
+        import matplotlib.pyplot as plt
+        plt.show()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Лабораторна 3: ідентифікація параметрів")
+    parser.add_argument("--starts", type=int, default=None,
+                        help="кількість стартів мультистарту (паралельно)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--solver", default="gn", choices=list(SOLVERS),
+                        help="gn — Гаусс-Ньютон, lm — Левенберг-Марквардт")
+    parser.add_argument("--stream", action="store_true",
+                        help="потоковий режим: дані та траєкторія блоками, без повних історій")
+    parser.add_argument("--chunk", type=int, default=4096,
+                        help="кількість точок у блоці для --stream")
+    parser.add_argument("--unknown", default=None,
+                        help="невідомі параметри через кому, напр. c1,c3,m1 або c2,m3")
+    parser.add_argument("--known", default=None,
+                        help="значення відомих, напр. c1=0.14,m1=12 (доповнюють KNOWN_PARAMS)")
+    parser.add_argument("--surface", type=int, default=None,
+                        help="розмір сітки поверхні втрат по перших двох невідомих, напр. 100")
+    parser.add_argument("--integrator", default="rk4", choices=["rk4", "expm", "dopri"],
+                        help="rk4/expm — крок dt, dopri — адаптивний Дорман-Принс")
+    parser.add_argument("--rtol", type=float, default=1e-6,
+                        help="відносний допуск для --integrator dopri")
+    parser.add_argument("--report", default=None,
+                        help="JSON-звіт замірів: час і виклики по фазах, лічильники, пам'ять")
+    parser.add_argument("--profile", default=None,
+                        help="файл для статистики cProfile (*.prof)")
+    parser.add_argument("--plots", default="show", choices=["show", "headless", "none"],
+                        help="show — вікно з графіками, headless — лише PNG у фонових "
+                             "процесах, none — без matplotlib")
+    args = parser.parse_args()
+    unknown = args.unknown.split(",") if args.unknown else None
+    known = dict(
+        (name, float(value))
+        for name, value in (item.split("=") for item in args.known.split(","))
+    ) if args.known else None
+    run_args = (args.starts, args.workers, args.solver, args.stream, args.chunk, unknown,
+                known, args.surface, args.integrator, args.rtol, args.plots)
+    
+    if args.report:
+        PROFILE.start()
+    if args.profile:
+        import cProfile
+        import pstats
+        
+        profiler = cProfile.Profile()
+        profiler.runcall(main, *run_args)
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+    else:
+        main(*run_args)
+    if args.report:
+        PROFILE.print_report(PROFILE.write_json(args.report))
+        print(f"Звіт збережено у {args.report}")
\ No newline at end of file
@@ -0,0 +1,152 @@
+# file: model.py
+#
+# система з 3 мас та 4 пружин, Y = [x1, v1, x2, v2, x3, v3]:
+#   m1*a1 = -c1*x1 + c2*(x2 - x1)
+#   m2*a2 = -c2*(x2 - x1) + c3*(x3 - x2)
+#   m3*a3 = -c3*(x3 - x2) - c4*x3
+#
+# A лінійна за жорсткостями: A = K + diag(1/m) Σ_k c_k E_k, де K — кінематика
+# (dx_i/dt = v_i), E_k — внесок пружини k у сили. тому для будь-якого
+# набору невідомих β ⊂ {c1..c4, m1..m3}:
+#   ∂A/∂c_k = diag(1/m) E_k,     ∂A/∂m_i = -(рядок v_i матриці A - K) / m_i
+# E_k, K та індекси будуються один раз у конструкторі MassSpringModel,
+# matrices(beta) лише множить та масштабує готові масиви.
+
+import numpy as np
+
+STIFFNESS = ("c1", "c2", "c3", "c4")
+MASSES = ("m1", "m2", "m3")
+PARAM_NAMES = STIFFNESS + MASSES
+
+# межі для випадкових початкових наближень (мультистарт)
+DEFAULT_BOUNDS = {
+    "c1": (0.01, 1.0), "c2": (0.01, 1.0), "c3": (0.01, 1.0), "c4": (0.01, 1.0),
+    "m1": (1.0, 30.0), "m2": (1.0, 30.0), "m3": (1.0, 30.0),
+}
+
+# початкове наближення за замовчуванням
+DEFAULT_GUESS = {
+    "c1": 0.1, "c2": 0.1, "c3": 0.1, "c4": 0.1,
+    "m1": 9.0, "m2": 9.0, "m3": 9.0,
+}
+
+# пружина k з'єднує маси (i, j); None — стіна
+_SPRINGS = ((0, None), (0, 1), (1, 2), (2, None))
+
+
+def _spring_matrices() -> np.ndarray:
+    """
+    E (4, 6, 6): сила на масу i від пружини k (ще без ділення на m_i)
+    """
+    E = np.zeros((len(_SPRINGS), 6, 6))
+    for k, (i, j) in enumerate(_SPRINGS):
+        E[k, 2 * i + 1, 2 * i] -= 1.0
+        if j is not None:
+            E[k, 2 * i + 1, 2 * j] += 1.0
+            E[k, 2 * j + 1, 2 * j] -= 1.0
+            E[k, 2 * j + 1, 2 * i] += 1.0
+    return E
+
+
+class MassSpringModel:
+    """
+    модель з довільним набором невідомих unknown (імена з PARAM_NAMES),
+    решта параметрів — у known. екземпляр можна передавати туди, де
+    очікується system_matrices(params) -> (A, D), напр. в objective.py
+    """
+
+    def __init__(self, unknown=("c1", "c3", "m1"), known=None):
+        known = dict(known or {})
+        unknown = tuple(unknown)
+        bad = [p for p in unknown + tuple(known) if p not in PARAM_NAMES]
+        if bad:
+            raise ValueError(f"Невідомі імена параметрів: {bad}, доступні: {PARAM_NAMES}")
+        if len(set(unknown)) != len(unknown):
+            raise ValueError(f"Параметри повторюються: {unknown}")
+        missing = [p for p in PARAM_NAMES if p not in unknown and p not in known]
+        if missing:
+            raise ValueError(f"Не задано значення відомих параметрів: {missing}")
+
+        self.unknown = unknown
+        self.known = {p: float(v) for p, v in known.items() if p not in unknown}
+
+        self._values = np.array([self.known.get(p, np.nan) for p in PARAM_NAMES])
+        self._slots = np.array([PARAM_NAMES.index(p) for p in unknown], dtype=int)
+
+        self._E = _spring_matrices()
+        self._K = np.zeros((6, 6))
+        self._K[[0, 2, 4], [1, 3, 5]] = 1.0
+        # рядок v_i ділиться на m_i: номер маси для кожного рядка A
+        self._mass_of_row = np.repeat(np.arange(3), 2)
+        self._is_velocity = np.tile([False, True], 3)
+
+        # для кожної невідомої: ("c", k) або ("m", i)
+        self._kinds = [
+            ("c", STIFFNESS.index(p)) if p in STIFFNESS else ("m", MASSES.index(p))
+            for p in unknown
+        ]
+
+    @property
+    def n_params(self) -> int:
+        return len(self.unknown)
+
+    @property
+    def bounds(self) -> np.ndarray:
+        return np.array([DEFAULT_BOUNDS[p] for p in self.unknown])
+
+    @property
+    def initial_guess(self) -> np.ndarray:
+        return np.array([DEFAULT_GUESS[p] for p in self.unknown])
+
+    def full_params(self, beta) -> np.ndarray:
+        """
+        усі 7 параметрів [c1..c4, m1..m3] для вектора невідомих beta
+        """
+        values = self._values.copy()
+        values[self._slots] = beta
+        return values
+
+    def matrices(self, beta):
+        """
+        A (6x6) та D (P, 6, 6), D[j] = ∂A/∂beta_j
+        """
+        values = self.full_params(beta)
+        c, m = values[:4], values[4:]
+        inv_m = np.where(self._is_velocity, 1.0 / m[self._mass_of_row], 0.0)
+
+        F = np.tensordot(c, self._E, axes=1)          # сили, 6x6
+        A = self._K + inv_m[:, None] * F
+
+        D = np.zeros((self.n_params, 6, 6))
+        for j, (kind, idx) in enumerate(self._kinds):
+            if kind == "c":
+                D[j] = inv_m[:, None] * self._E[idx]
+            else:
+                row = 2 * idx + 1
+                D[j, row] = -(A[row] - self._K[row]) / m[idx]
+        return A, D
+
+    def matrices_batch(self, betas):
+        """
+        те саме для K векторів невідомих betas (K, P):
+        A (K, 6, 6) та D (K, P, 6, 6), без циклу по K
+        """
+        betas = np.atleast_2d(np.asarray(betas, dtype=float))
+        values = np.broadcast_to(self._values, (len(betas), len(PARAM_NAMES))).copy()
+        values[:, self._slots] = betas
+        c, m = values[:, :4], values[:, 4:]
+        inv_m = np.where(self._is_velocity, 1.0 / m[:, self._mass_of_row], 0.0)
+
+        F = np.einsum("kc,cij->kij", c, self._E)
+        A = self._K + inv_m[:, :, None] * F
+
+        D = np.zeros((len(betas), self.n_params, 6, 6))
+        for j, (kind, idx) in enumerate(self._kinds):
+            if kind == "c":
+                D[:, j] = inv_m[:, :, None] * self._E[idx]
+            else:
+                row = 2 * idx + 1
+                D[:, j, row] = -(A[:, row] - self._K[row]) / m[:, idx, None]
+        return A, D
+
+    __call__ = matrices
@@ -0,0 +1,143 @@
+# file: multistart.py
+#
+# мультистарт Гаусса-Ньютона (або Левенберга-Марквардта, solver="lm"): багато початкових наближень невідомих
+# (за замовчуванням [c1, c3, m1]) у межах PARAM_BOUNDS або model.bounds, кожне — окреме завдання в пулі процесів.
+# найменша досягнута втрата спільна для всіх процесів (multiprocessing.Value),
+# старт зупиняється достроково, якщо після min_iter ітерацій його втрата
+# більша за cut_factor * best і за останню ітерацію зменшилась менш ніж
+# у 1/shrink разів (збіжні старти Гаусса-Ньютона спадають набагато швидше).
+# переможець обирається лише серед стартів зі статусом збіжності (CONVERGED).
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from main import PARAM_BOUNDS, SOLVERS, get_system_matrices
+from objective import InMemoryObjective
+
+# статуси, що означають збіжність: інші — обрив, розбіжність або вичерпаний
+# ліміт ітерацій. "lambda" у Левенберга-Марквардта — втрату вже не вдається
+# зменшити, тобто старт дійшов до мінімуму (при ненульових нев'язках)
+CONVERGED = ("tol", "step", "lambda")
+
+# стан процесу-виконавця (заповнює _init_worker)
+_best = None
+_data = None
+
+
+def sample_starts(n_starts: int, bounds=PARAM_BOUNDS, seed: int = 0) -> np.ndarray:
+    """
+    латинський гіперкуб: n_starts точок (n_starts, P), по одній у кожному
+    з n_starts рівних інтервалів вздовж кожної осі
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    rng = np.random.default_rng(seed)
+    P = len(bounds)
+    strata = np.stack([rng.permutation(n_starts) for _ in range(P)], axis=1)
+    u = (strata + rng.random((n_starts, P))) / n_starts
+    return bounds[:, 0] + u * (bounds[:, 1] - bounds[:, 0])
+
+
+def _init_worker(best, Y_obs, Y0, times, model, options):
+    global _best, _data
+    _best = best
+    _data = (Y_obs, Y0, times, model, options)
+
+
+def _offer(loss: float) -> float:
+    """
+    оновлює спільний мінімум втрати і повертає його
+    """
+    with _best.get_lock():
+        if np.isfinite(loss) and loss < _best.value:
+            _best.value = loss
+        return _best.value
+
+
+def _run_start(index, params0, max_iter, tol, cut_factor, min_iter, shrink, solver):
+    Y_obs, Y0, times, model, options = _data
+    objective = InMemoryObjective(Y_obs, Y0, times, model or get_system_matrices,
+                                  **(options or {}))
+    previous = [np.inf]
+
+    def should_stop(iteration, loss):
+        best = _offer(loss)
+        stalled = loss > shrink * previous[0]
+        previous[0] = loss
+        return iteration + 1 >= min_iter and stalled and loss > cut_factor * best
+
+    with np.errstate(all="ignore"):
+        params, loss_history, status = SOLVERS[solver](
+            Y_obs, Y0, params0, times, max_iter, tol,
+            verbose=False, should_stop=should_stop, objective=objective,
+        )
+        # loss_history[-1] — втрата до останнього кроку ("step", "max_iter"),
+        # тож втрата рахується заново в повернутих параметрах
+        loss = float(objective.loss(params)) if np.all(np.isfinite(params)) else np.inf
+    if not np.isfinite(loss):
+        loss = np.inf
+    _offer(loss)
+    return {
+        "start": index,
+        "initial": np.asarray(params0),
+        "params": params,
+        "loss": loss,
+        "iterations": len(loss_history),
+        "status": status,
+        "loss_history": [float(value) for value in loss_history],
+    }
+
+
+def run_multistart(Y_obs, Y0, times, n_starts: int = 16, bounds=None,
+                   seed: int = 0, workers=None, max_iter: int = 50,
+                   tol: float = 1e-5, cut_factor: float = 100.0, min_iter: int = 5,
+                   shrink: float = 0.5, model=None, options=None, solver: str = "gn"):
+    """
+    solver — ключ main.SOLVERS: "gn" (Гаусс-Ньютон) або "lm" (Левенберг-Марквардт),
+    model — MassSpringModel з іншим набором невідомих (None — модель main.py),
+    options — параметри InMemoryObjective (method, rtol, atol),
+    bounds за замовчуванням — model.bounds або PARAM_BOUNDS.
+    повертає (best, stats): найкращий серед збіжних стартів (статус з
+    CONVERGED; None, якщо жоден не зійшовся) та список результатів усіх
+    стартів (словники start, initial, params, loss, iterations, status,
+    loss_history — втрати за ітераціями, напр. для графіка збіжності)
+    """
+    if bounds is None:
+        bounds = PARAM_BOUNDS if model is None else model.bounds
+    starts = sample_starts(n_starts, bounds, seed)
+    best = mp.Value("d", np.inf)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(best, Y_obs, Y0, times, model, options)) as pool:
+        futures = [
+            pool.submit(_run_start, i, p0, max_iter, tol, cut_factor, min_iter,
+                        shrink, solver)
+            for i, p0 in enumerate(starts)
+        ]
+        stats = [fut.result() for fut in futures]
+
+    converged = [s for s in stats if s["status"] in CONVERGED and np.isfinite(s["loss"])]
+    winner = min(converged, key=lambda s: s["loss"]) if converged else None
+    return winner, stats
+
+
+def print_multistart_report(best, stats, names=("c1", "c3", "m1")) -> None:
+    names = ", ".join(names)
+    print(f"\n--- Мультистарт: {len(stats)} стартів ---")
+    print(f"{'#':>3} | {'початок [' + names + ']':<28} | {'кінець [' + names + ']':<28} | "
+          f"{'Loss':<11} | {'ітер':>4} | статус")
+    print("-" * 96)
+    for s in stats:
+        init = ", ".join(f"{v:.3f}" for v in s["initial"])
+        final = ", ".join(f"{v:.4f}" for v in s["params"])
+        print(f"{s['start']:>3} | {init:<28} | {final:<28} | {s['loss']:<11.4e} | "
+              f"{s['iterations']:>4} | {s['status']}")
+
+    counts = {}
+    for s in stats:
+        counts[s["status"]] = counts.get(s["status"], 0) + 1
+    print("Статуси: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    if best is not None:
+        print(f"Найкращий старт #{best['start']}: Loss = {best['loss']:.4e}, "
+              f"Params = {best['params']}")
@@ -0,0 +1,118 @@
+# file: objective.py
+#
+# функціонал МНК  Φ(β) = Σ_t ||y_obs(t) - y(t; β)||²  та нормальні рівняння
+# Гаусса-Ньютона для нього. два способи обчислення з однаковим контрактом:
+#   InMemoryObjective  — спостереження (6, N) у пам'яті, траєкторія цілком;
+#   StreamingObjective — спостереження (N, 6) (зазвичай memmap з observations.py),
+#                        траєкторія рахується блоками по chunk моментів часу,
+#                        Φ, JᵀJ та JᵀR накопичуються на льоту.
+# full(params) -> (loss, JtJ, JtR), loss(params) -> loss (лише стан).
+# system_matrices(params) -> (A, D) — модель, див. get_system_matrices у main.py
+
+import numpy as np
+
+from instrumentation import PROFILE
+from integrators import (
+    STEP_MATRICES,
+    count_steps,
+    propagate_chunks,
+    solve_linear,
+    solve_linear_sensitivity,
+    step_matrix,
+)
+from observations import iter_chunks
+
+
+@PROFILE.timed("jacobian")
+def normal_equations(U_model, Residuals):
+    """
+    JᵀJ (P x P) та JᵀR (P) напряму з чутливості U (6, P, N) і нев'язок (6, N),
+    без матриці Якобі J розміру (6*N_points, P):
+      (JᵀJ)_pq = Σ_v Σ_t U[v,p,t] U[v,q,t],   (JᵀR)_p = Σ_v Σ_t U[v,p,t] R[v,t]
+    """
+    JtJ = np.einsum("vpt,vqt->pq", U_model, U_model, optimize=True)
+    JtR = np.einsum("vpt,vt->p", U_model, Residuals, optimize=True)
+    return JtJ, JtR
+
+
+class InMemoryObjective:
+    """
+    Y_obs (6, N) на сітці times, початковий стан Y0.
+    method — rk4, expm або dopri (адаптивний, з допуском rtol, atol)
+    """
+
+    def __init__(self, Y_obs, Y0, times, system_matrices, method: str = "rk4",
+                 rtol: float = 1e-6, atol: float = 1e-9):
+        self.Y_obs = Y_obs
+        self.Y0 = Y0
+        self.times = times
+        self.system_matrices = system_matrices
+        self.method = method
+        self.tolerances = {"rtol": rtol, "atol": atol}
+
+    def full(self, params):
+        A, D = self.system_matrices(params)
+        Y_model, U_model = solve_linear_sensitivity(A, D, self.Y0, self.times, self.method,
+                                                    **self.tolerances)
+        Residuals = self.Y_obs - Y_model
+        JtJ, JtR = normal_equations(U_model, Residuals)
+        return np.sum(Residuals**2), JtJ, JtR
+
+    def loss(self, params):
+        A, _ = self.system_matrices(params)
+        Y_model = solve_linear(A, self.Y0, self.times, self.method, **self.tolerances)
+        return np.sum((self.Y_obs - Y_model) ** 2)
+
+
+class StreamingObjective:
+    """
+    спостереження obs (N, 6) з кроком dt, початковий стан — obs[0].
+    у пам'яті одночасно лише chunk моментів часу: блок спостережень
+    і блок розширеного стану (chunk, 6 * (P + 1)). лише методи з матрицею
+    кроку (rk4, expm)
+    """
+
+    def __init__(self, obs, dt: float, system_matrices, chunk: int = 4096,
+                 method: str = "rk4"):
+        if method not in STEP_MATRICES:
+            raise ValueError(f"Потоковий режим підтримує лише {', '.join(STEP_MATRICES)}")
+        self.obs = obs
+        self.dt = dt
+        self.system_matrices = system_matrices
+        self.chunk = chunk
+        self.method = method
+        self.Y0 = np.asarray(obs[0], dtype=float)
+
+    def full(self, params):
+        A, D = self.system_matrices(params)
+        n, P = A.shape[0], len(D)
+        S = step_matrix(A, D, self.dt, self.method)
+        z0 = np.zeros(n * (P + 1))
+        z0[:n] = self.Y0
+
+        loss = 0.0
+        JtJ = np.zeros((P, P))
+        JtR = np.zeros(P)
+        count_steps(len(self.obs) - 1)
+        with PROFILE.phase("integrate"):
+            blocks = propagate_chunks(S, z0, len(self.obs), self.chunk)
+            for Z, Y_block in zip(blocks, iter_chunks(self.obs, self.chunk)):
+                k = len(Z)
+                Residuals = (Y_block - Z[:, :n]).T
+                U_block = Z[:, n:].reshape(k, P, n).transpose(2, 1, 0)
+                dJtJ, dJtR = normal_equations(U_block, Residuals)
+                loss += np.sum(Residuals**2)
+                JtJ += dJtJ
+                JtR += dJtR
+        return loss, JtJ, JtR
+
+    def loss(self, params):
+        A, _ = self.system_matrices(params)
+        S = step_matrix(A, None, self.dt, self.method)
+        count_steps(len(self.obs) - 1)
+        with PROFILE.phase("integrate"):
+            blocks = propagate_chunks(S, self.Y0, len(self.obs), self.chunk)
+            return sum(
+                np.sum((Y_block - Z) ** 2)
+                for Z, Y_block in zip(blocks, iter_chunks(self.obs, self.chunk))
+            )
@@ -0,0 +1,165 @@
+# file: observations.py
+#
+# потокове читання спостережень y(t) з текстового файлу в будь-якій орієнтації:
+#   "rows"    — 6 рядків (змінні) по N чисел (як y3.txt);
+#   "columns" — N рядків (моменти часу) по 6 чисел.
+# файл розбирається блоками, повністю в пам'ять не читається.
+# розібрані дані зберігаються поруч як <файл>.npy у вигляді (N, 6) —
+# наступні запуски відкривають його через np.load(mmap_mode="r") без розбору тексту.
+
+import os
+from itertools import islice
+
+import numpy as np
+
+N_VARS = 6
+
+
+def scan_lines(path: str, block: int = 1 << 20):
+    """
+    один прохід по файлу: список (зсув початку рядка, кількість чисел)
+    для кожного непорожнього рядка
+    """
+    lines = []
+    offset = 0          # зсув поточного блоку від початку файлу
+    start = 0           # зсув початку поточного рядка
+    count = 0
+    carry = b""         # недочитане число на межі блоків
+    with open(path, "rb") as fh:
+        while True:
+            buf = fh.read(block)
+            if not buf:
+                break
+            pos = 0
+            while True:
+                nl = buf.find(b"\n", pos)
+                data = carry + buf[pos:nl if nl >= 0 else len(buf)]
+                tokens = data.split()
+                if nl < 0:
+                    if tokens and not data[-1:].isspace():
+                        carry = tokens.pop()
+                    else:
+                        carry = b""
+                    count += len(tokens)
+                    break
+                count += len(tokens)
+                carry = b""
+                if count:
+                    lines.append((start, count))
+                start = offset + nl + 1
+                count = 0
+                pos = nl + 1
+            offset += len(buf)
+    count += len(carry.split())
+    if count:
+        lines.append((start, count))
+    return lines
+
+
+def detect_layout(lines):
+    """
+    ("rows" | "columns", N) за результатом scan_lines
+    """
+    if len(lines) == N_VARS and lines[0][1] > N_VARS:
+        counts = {c for _, c in lines}
+        if len(counts) != 1:
+            raise ValueError(f"Рядки змінних різної довжини: {sorted(counts)}")
+        return "rows", lines[0][1]
+    if any(c != N_VARS for _, c in lines):
+        raise ValueError(f"Очікується {N_VARS} чисел у кожному рядку або {N_VARS} рядків")
+    return "columns", len(lines)
+
+
+def _float_blocks(path: str, offset: int, count: int, chunk: int, block: int = 1 << 16):
+    """
+    count чисел рядка, що починається з offset, блоками по chunk
+    """
+    pending = []
+    have = 0
+    carry = b""
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        while count > 0:
+            buf = fh.read(block)
+            data = carry + buf
+            tokens = data.split()
+            if buf and tokens and not data[-1:].isspace():
+                carry = tokens.pop()
+            else:
+                carry = b""
+            tokens = tokens[:count]
+            count -= len(tokens)
+            if tokens:
+                pending.append(np.array(tokens, dtype=float))
+                have += len(tokens)
+            while have >= chunk or (have and (count == 0 or not buf)):
+                values = np.concatenate(pending)
+                yield values[:chunk]
+                pending = [values[chunk:]]
+                have = pending[0].size
+            if not buf:
+                break
+    if count > 0:
+        raise ValueError(f"{path}: рядок обірвався, бракує {count} чисел")
+
+
+def iter_text_chunks(path: str, chunk: int = 4096, lines=None):
+    """
+    блоки спостережень (k, 6), k <= chunk, у порядку часу — без кешу.
+    lines — готовий результат scan_lines, щоб не сканувати файл вдруге
+    """
+    if lines is None:
+        lines = scan_lines(path)
+    layout, N = detect_layout(lines)
+    if layout == "rows":
+        streams = [_float_blocks(path, off, N, chunk) for off, _ in lines]
+        for parts in zip(*streams):
+            yield np.stack(parts, axis=1)
+    else:
+        with open(path, "r") as fh:
+            rows = (line for line in fh if line.strip())
+            while True:
+                batch = list(islice(rows, chunk))
+                if not batch:
+                    break
+                yield np.loadtxt(batch, ndmin=2)
+
+
+def cache_path(path: str) -> str:
+    return path + ".npy"
+
+
+def load_observations(path: str, cache: bool = True, chunk: int = 4096) -> np.ndarray:
+    """
+    спостереження (N, 6). з cache=True повертає відображений у пам'ять .npy
+    (створює його при першому виклику або коли текстовий файл новіший)
+    """
+    npy = cache_path(path)
+    if cache and os.path.exists(npy) and os.path.getmtime(npy) >= os.path.getmtime(path):
+        return np.load(npy, mmap_mode="r")
+
+    lines = scan_lines(path)
+    _, N = detect_layout(lines)
+    if cache:
+        out = np.lib.format.open_memmap(npy + ".tmp", mode="w+", dtype=float,
+                                        shape=(N, N_VARS))
+    else:
+        out = np.empty((N, N_VARS))
+    filled = 0
+    for block in iter_text_chunks(path, chunk, lines):
+        out[filled:filled + len(block)] = block
+        filled += len(block)
+    if not cache:
+        return out
+    out.flush()
+    del out
+    os.replace(npy + ".tmp", npy)
+    return np.load(npy, mmap_mode="r")
+
+
+def iter_chunks(obs: np.ndarray, chunk: int = 4096):
+    """
+    блоки (k, 6) масиву спостережень (N, 6) — для memmap читаються лише вони
+    """
+    for start in range(0, len(obs), chunk):
+        yield np.asarray(obs[start:start + chunk], dtype=float)
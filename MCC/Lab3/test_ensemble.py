@@ -0,0 +1,26 @@
+import numpy as np
+
+from ensemble import ensemble_loss, ensemble_normal_equations
+from integrators import solve_linear
+from main import MODEL
+from objective import InMemoryObjective
+
+
+def test_ensemble_matches_serial_normal_equations():
+    times = np.linspace(0.0, 5.0, 201)
+    h = times[1] - times[0]
+    Y0 = np.array([0.1, 0.0, 0.2, 0.0, -0.1, 0.0])
+    # "спостереження" — траєкторія при інших параметрах
+    Y_obs = solve_linear(MODEL.matrices(MODEL.initial_guess * 1.05)[0], Y0, times)
+    betas = MODEL.initial_guess * np.array([[1.0, 1.0, 1.0], [1.2, 0.9, 1.1], [0.8, 1.3, 0.7]])
+
+    A, D = MODEL.matrices_batch(betas)
+    loss, JtJ, JtR = ensemble_normal_equations(A, D, Y_obs, Y0, h)
+    np.testing.assert_allclose(ensemble_loss(A, Y_obs, Y0, h), loss, rtol=1e-12)
+
+    serial = InMemoryObjective(Y_obs, Y0, times, MODEL.matrices)
+    for k, beta in enumerate(betas):
+        loss_k, JtJ_k, JtR_k = serial.full(beta)
+        np.testing.assert_allclose(loss[k], loss_k, rtol=1e-10)
+        np.testing.assert_allclose(JtJ[k], JtJ_k, rtol=1e-10)
+        np.testing.assert_allclose(JtR[k], JtR_k, rtol=1e-10, atol=1e-12)
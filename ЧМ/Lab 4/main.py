@@ -1,13 +1,21 @@
 import numpy as np
 import math
+import multiprocessing
+import os
+import sys
+
+# polynomial.py та roots.py спільні для лабораторних ЧМ і лежать у ЧМ/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+from polynomial import Polynomial
+from roots import find_roots
 
 # ==========================================
 # 1. ФУНКЦІЯ ТА ВУЗЛИ
 # ==========================================
 
-def f(x):
-    # Варіант 2: 2*x^6 + 3*x^5 + 4*x^2 - 1
-    return 2 * x**6 + 3 * x**5 + 4 * x**2 - 1
+# Варіант 2: 2*x^6 + 3*x^5 + 4*x^2 - 1 (схема Горнера, див. polynomial.py)
+f = Polynomial([2, 3, 0, 0, 4, 0, -1])
 
 def get_chebyshev_nodes(a, b, n):
     """Генерація n вузлів Чебишова на відрізку [a, b]."""
@@ -46,14 +54,37 @@ def newton_poly(coef, x_data, x):
 # 3. ОСНОВНА ЧАСТИНА
 # ==========================================
 
+def interpolation_error(x_nodes, a, b, coef, n_plot=200):
+    """Максимальна похибка |f(x) - P(x)| на сітці з n_plot точок."""
+    x_plot = np.linspace(a, b, n_plot)
+    return np.max(np.abs(f(x_plot) - newton_poly(coef, x_nodes, x_plot)))
+
+def direct_root(coef, x_nodes, x0):
+    """
+    корінь полінома Ньютона P(x) методом Ньютона з scipy, починаючи з x0.
+    scipy імпортується лише тут: решта лабораторної без нього працює
+    """
+    try:
+        from scipy.optimize import newton
+    except ImportError as error:
+        raise ImportError("для прямої інтерполяції потрібен scipy "
+                          "(pip install scipy)") from error
+    return newton(lambda x: newton_poly(coef, x_nodes, x), x0)
+
 def generate_plots(x_nodes, y_nodes, a, b, coef):
+    """
+    Графіки інтерполяції та похибки (graph_task_1.png, graph_task_2.png).
+    matplotlib імпортується лише тут, з бекендом Agg (без GUI).
+    """
     try:
+        import matplotlib
+        matplotlib.use("Agg")
         import matplotlib.pyplot as plt
         
         # Графік 1: Функція та Поліном
         x_plot = np.linspace(a, b, 200)
         y_true = f(x_plot)
-        y_interp = [newton_poly(coef, x_nodes, xi) for xi in x_plot]
+        y_interp = newton_poly(coef, x_nodes, x_plot)
         
         plt.figure(figsize=(10, 6))
         plt.plot(x_plot, y_true, 'b-', label='Функція $f(x)$', linewidth=2)
@@ -80,14 +111,11 @@ def generate_plots(x_nodes, y_nodes, a, b, coef):
         plt.savefig("graph_task_2.png")
         plt.close()
         print("Графік похибки збережено як 'graph_task_2.png'")
-        
-        return np.max(error)
 
     except ImportError:
         print("[INFO] Matplotlib не знайдено. Графіки не згенеровано.")
-        return 0.0
 
-def main():
+def main(plots="headless"):
     print("\n" + "="*60)
     print("ЛАБОРАТОРНА РОБОТА №4: Інтерполяція")
     print("="*60)
@@ -110,8 +138,14 @@ def main():
     print("\nКоефіцієнти полінома Ньютона (розділені різниці):")
     print(coefs)
 
-    # Графіки та похибка
-    max_err = generate_plots(x_nodes, y_nodes, a, b, coefs)
+    # Графіки малює окремий процес (plots="headless") паралельно з рештою
+    # розрахунків, "none" — без matplotlib; похибка рахується тут
+    worker = None
+    if plots == "headless":
+        worker = multiprocessing.Process(target=generate_plots,
+                                         args=(x_nodes, y_nodes, a, b, coefs))
+        worker.start()
+    max_err = interpolation_error(x_nodes, a, b, coefs)
     print(f"\nМаксимальна похибка на відрізку: {max_err:.5e}")
 
     # 2. Знаходження кореня рівняння (f(x) = 0)
@@ -132,33 +166,36 @@ def main():
 
     # 2.2 Пряма інтерполяція (розв'язуємо P(x) = 0)
     # Оскільки корінь (близько 0.46) лежить поза межами [1, 5], метод може бути неточним.
-    # Спробуємо знайти корінь полінома чисельно
-    from scipy.optimize import brentq, newton
-    
-    # Функція-обгортка для полінома
-    def poly_func(x):
-        return newton_poly(coefs, x_nodes, x)
-    
+    # Спробуємо знайти корінь полінома чисельно (scipy.optimize.newton)
     print("\nМетод прямої інтерполяції (шукаємо нуль полінома P(x)):")
     try:
         # Шукаємо корінь поблизу 0.5 (хоча це екстраполяція)
-        root_direct = newton(poly_func, 0.5) 
+        root_direct = direct_root(coefs, x_nodes, 0.5)
         print(f"  Знайдений корінь x** ≈ {root_direct:.5f}")
         print(f"  Нев'язка f(x**) = {f(root_direct):.5e}")
-    except:
+    except ImportError as error:
+        print(f"  [INFO] Пропущено: {error}.")
+    except (RuntimeError, ArithmeticError):
         print("  Не вдалося знайти корінь методом Ньютона для полінома.")
 
-    # Перевірка справжнього кореня
-    print("\n[Довідка] Справжній корінь рівняння (fsolve):")
-    try:
-        from scipy.optimize import fsolve
-        true_root = fsolve(f, 0.5)[0]
-        print(f"  x_true ≈ {true_root:.5f}")
-    except:
-        pass
+    # Перевірка справжнього кореня: усі дійсні корені f одним викликом
+    # (ряд Штурма + паралельне уточнення, див. roots.py)
+    print("\n[Довідка] Справжні корені рівняння (ряд Штурма):")
+    true_roots, _, converged = find_roots(f)
+    for root in true_roots[converged]:
+        print(f"  x_true ≈ {root:.5f},  f(x_true) = {f(root):.1e}")
 
     print("\nПРИМІТКА: Корінь знаходиться поза проміжком інтерполяції [1, 5],")
     print("тому методи інтерполяції працюють в режимі екстраполяції, що знижує точність.")
+    
+    if worker is not None:
+        worker.join()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Лабораторна 4: інтерполяція")
+    parser.add_argument("--plots", default="headless", choices=["headless", "none"],
+                        help="headless — графіки у фоновому процесі, none — без matplotlib")
+    args = parser.parse_args()
+    main(args.plots)
\ No newline at end of file
@@ -1,4 +1,16 @@
 import math
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+# polynomial.py та roots.py спільні для лабораторних ЧМ і лежать у ЧМ/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+
+from polynomial import Polynomial
+from roots import find_roots
 
 # ==========================================
 # Налаштування та допоміжні функції
@@ -8,8 +20,11 @@ def generate_plots():
     """
     Генерація графіків функцій для пункту 1 звіту.
     Зберігає зображення у файли graph_task_1.png та graph_task_2.png.
+    matplotlib імпортується лише тут, з бекендом Agg (без GUI).
     """
     try:
+        import matplotlib
+        matplotlib.use("Agg")
         import matplotlib.pyplot as plt
         import numpy as np
     except ImportError:
@@ -18,9 +33,9 @@ def generate_plots():
 
     # Графік 1
     x = np.linspace(-0.5, 2.5, 400)
-    y = x**3 - 2*x**2 - x + 2
+    y = f1(x)
     plt.figure(figsize=(8, 6))
-    plt.plot(x, y, label=r'$x^3 - 2x^2 - x + 2$')
+    plt.plot(x, y, label=f'${f1}$')
     plt.axhline(0, color='black', linewidth=1)
     plt.axvline(0, color='black', linewidth=1)
     plt.grid(True, linestyle='--', alpha=0.7)
@@ -32,9 +47,9 @@ def generate_plots():
 
     # Графік 2
     x = np.linspace(-0.5, 3.5, 400)
-    y = x**3 - 4*x**2 + x + 6
+    y = f2(x)
     plt.figure(figsize=(8, 6))
-    plt.plot(x, y, color='green', label=r'$x^3 - 4x^2 + x + 6$')
+    plt.plot(x, y, color='green', label=f'${f2}$')
     plt.axhline(0, color='black', linewidth=1)
     plt.axvline(0, color='black', linewidth=1)
     plt.grid(True, linestyle='--', alpha=0.7)
@@ -45,112 +60,253 @@ def generate_plots():
     plt.close()
     print("[INFO] Графіки збережено у файли 'graph_task_1.png' та 'graph_task_2.png'")
 
+# ==========================================
+# Векторні ітерації: багато початкових наближень одночасно
+# ==========================================
+
+def iterate_many(step, x0, epsilon, max_iter=100, args=(), trace=False):
+    """
+    Спільне ядро ітераційних методів x_{n+1} = step(x_n, *args) для масиву
+    початкових наближень x0 (будь-якої форми). Кожен елемент зупиняється,
+    щойно |x_{n+1} - x_n| <= epsilon (збігся) або x став нескінченним
+    (розбігся); далі рахуються лише ще активні елементи.
+    args - параметри для кожного елемента (скаляри або масиви форми x0),
+    у step подаються лише їх активні частини.
+    Повертає (roots, iterations, converged) форми x0, з trace=True - ще й
+    список масивів x після кожної ітерації (для таблиць).
+    """
+    x = np.array(x0, dtype=float)
+    shape = x.shape
+    x = x.ravel()
+    args = [np.broadcast_to(np.asarray(a, dtype=float), shape).ravel() for a in args]
+    iterations = np.zeros(x.size, dtype=int)
+    converged = np.zeros(x.size, dtype=bool)
+    active = np.arange(x.size)
+    history = [x.reshape(shape).copy()] if trace else None
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for n in range(1, max_iter + 1):
+            if active.size == 0:
+                break
+            x_prev = x[active]
+            x_new = step(x_prev, *(a[active] for a in args))
+            x[active] = x_new
+            iterations[active] = n
+            if trace:
+                history.append(x.reshape(shape).copy())
+
+            done = np.abs(x_new - x_prev) <= epsilon
+            converged[active[done]] = True
+            active = active[~done & np.isfinite(x_new)]
+
+    result = (x.reshape(shape), iterations.reshape(shape), converged.reshape(shape))
+    return result + (history,) if trace else result
+
+def relaxation_many(f, x0, tau, epsilon, max_iter=100, args=(), trace=False):
+    """
+    Метод релаксації x_{n+1} = x_n + tau * f(x_n) для масиву x0.
+    tau - скаляр або масив форми x0 (знак tau обирається за знаком f').
+    args - коефіцієнти рівняння для кожного елемента: f(x, *args),
+    наприклад f=horner з polynomial.py і args - коефіцієнти поліномів.
+    """
+    def step(x, tau, *coefs):
+        return x + tau * f(x, *coefs)
+
+    return iterate_many(step, x0, epsilon, max_iter, (tau,) + tuple(args), trace)
+
+def mod_newton_many(f, df, x0, epsilon, max_iter=100, args=(), trace=False):
+    """
+    Модифікований метод Ньютона x_{n+1} = x_n - f(x_n) / f'(x_0) для масиву x0:
+    похідна фіксується в початковому наближенні кожного елемента.
+    df=None - для f типу Polynomial похідна береться як f.derivative().
+    """
+    x0 = np.asarray(x0, dtype=float)
+    if df is None:
+        df = f.derivative()
+    df_x0 = df(x0, *args)
+
+    def step(x, d, *coefs):
+        return x - f(x, *coefs) / d
+
+    return iterate_many(step, x0, epsilon, max_iter, (df_x0,) + tuple(args), trace)
+
+def print_iteration_table(f, xs):
+    """Таблиця n | xn | f(xn) | |xn - xn-1| за послідовністю наближень xs."""
+    print("\nТаблиця результатів:")
+    print(f"{'n':<5} | {'xn':<15} | {'f(xn)':<15} | {'|xn - xn-1|':<15}")
+    print("-" * 58)
+    print(f"{0:<5} | {xs[0]:<15.10f} | {f(xs[0]):<15.10f} | {'-':<15}")
+    for n in range(1, len(xs)):
+        diff = abs(xs[n] - xs[n - 1])
+        print(f"{n:<5} | {xs[n]:<15.10f} | {f(xs[n]):<15.10f} | {diff:<15.10f}")
+
 # ==========================================
 # ЗАВДАННЯ 1: Метод релаксації
 # ==========================================
 
-def f1(x):
-    return x**3 - 2*x**2 - x + 2
+# Поліноми задані коефіцієнтами (від старшого степеня) і рахуються
+# за схемою Горнера - див. polynomial.py
+f1 = Polynomial([1, -2, -1, 2])       # x^3 - 2x^2 - x + 2
+
+def derivative_bounds(f, a, b, pieces=10000):
+    """
+    Межі m <= |f'(x)| <= M на [a, b] для полінома f.
+    Спершу f' рахується векторно на сітці з pieces + 1 точок (наближені межі
+    і перевірка знаку), потім гарантовані межі дає інтервальна схема Горнера
+    на pieces частинах відрізка. Повертає (m, M, знак f', (m, M) за сіткою)
+    або None, якщо f' може змінювати знак на [a, b].
+    """
+    df = f.derivative()
+    sample = df(np.linspace(a, b, pieces + 1))
+    if sample.min() <= 0 <= sample.max():
+        return None
+    lo, hi = df.enclose(a, b, pieces)
+    if np.any((lo <= 0) & (hi >= 0)):
+        return None
+    low, high = np.abs(lo), np.abs(hi)
+    m = np.minimum(low, high).min()
+    M = np.maximum(low, high).max()
+    sample = np.abs(sample)
+    return m, M, np.sign(lo[0]), (sample.min(), sample.max())
+
+def relaxation_parameters(m, M, sign=-1.0):
+    """
+    Оптимальний параметр методу релаксації tau = 2 / (M + m) (зі знаком,
+    протилежним до f', для ітерації x + tau * f(x)) і q = (M - m) / (M + m).
+    """
+    return -sign * 2 / (M + m), (M - m) / (M + m)
+
+def apriori_iterations(q, dist, epsilon):
+    """
+    Апріорна оцінка n >= ln(dist / eps) / ln(1/q) для |x0 - x*| <= dist.
+    x0 уже ближче за eps - 0 ітерацій; q = 0 (f лінійна) - одна.
+    """
+    if dist <= epsilon:
+        return 0
+    if q == 0:
+        return 1
+    return math.floor(math.log(dist / epsilon) / math.log(1/q)) + 1
 
-def solve_relaxation(epsilon):
+def solve_relaxation(epsilon, f=f1, x0=0.5, a=0.5, b=1.5, table=True):
+    """
+    f - поліном (Polynomial), [a, b] - відрізок з коренем і x0.
+    Межі |f'(x)|, tau, q та апріорна оцінка рахуються за [a, b].
+    Повертає (корінь, кількість ітерацій, збіжність).
+    """
     print("\n" + "="*60)
     print("ЗАВДАННЯ 1: Метод релаксації")
     print("="*60)
     
-    # Параметри з теоретичного обґрунтування
-    x0 = 0.5
-    x_target = 1.0 # Для розрахунку апріорної оцінки
-    m1 = 0.25
-    M1 = 2.25
+    if not a <= x0 <= b:
+        print(f"Помилка: x0 = {x0} поза відрізком [{a}, {b}]")
+        return float("nan"), 0, False
+    if f(a) * f(b) > 0:
+        print(f"Помилка: f(a) і f(b) одного знаку, відрізок [{a}, {b}] не відокремлює корінь")
+        return float("nan"), 0, False
+    bounds = derivative_bounds(f, a, b)
+    if bounds is None:
+        print(f"Помилка: f'(x) змінює знак на [{a}, {b}], метод релаксації не застосовний")
+        return float("nan"), 0, False
+    m1, M1, sign, (m_grid, M_grid) = bounds
     
     # Розрахунок tau та q
-    tau = 2 / (M1 + m1)
-    q = (M1 - m1) / (M1 + m1)
+    tau, q = relaxation_parameters(m1, M1, sign)
     
+    print(f"Межі |f'(x)| на [{a}, {b}]: m1 = {m1:.4f}, M1 = {M1:.4f} "
+          f"(за сіткою: {m_grid:.4f}, {M_grid:.4f})")
     print(f"Параметр tau: {tau:.4f}")
     print(f"Коефіцієнт q:   {q:.4f}")
     
     # Пункт 3: Апріорна оцінка (перераховується програмою)
-    dist = abs(x0 - x_target) # Або довжина інтервалу
-    if q < 1:
-        n_apriori = math.floor(math.log(dist / epsilon) / math.log(1/q)) + 1
-        print(f"Апріорна оцінка кількості ітерацій (для eps={epsilon}): {n_apriori}")
-    else:
-        print("Апріорна оцінка неможлива (q >= 1)")
+    # корінь на [a, b], до того ж |f(x0)| = |f'(xi)| * |x0 - x*| >= m1 * |x0 - x*|
+    dist = min(abs(f(x0)) / m1, max(x0 - a, b - x0))
+    n_apriori = apriori_iterations(q, dist, epsilon)
+    print(f"Апріорна оцінка кількості ітерацій (для eps={epsilon}): {n_apriori}")
         
-    # Пункт 4: Таблиця результатів
-    print("\nТаблиця результатів:")
-    print(f"{'n':<5} | {'xn':<15} | {'f(xn)':<15} | {'|xn - xn-1|':<15}")
-    print("-" * 58)
+    # Ітерація: x = x + tau * f(x) (tau > 0 при f' < 0)
+    root, n, converged, history = relaxation_many(f, x0, tau, epsilon, trace=True)
     
-    xn = x0
-    n = 0
-    print(f"{n:<5} | {xn:<15.10f} | {f1(xn):<15.10f} | {'-':<15}")
-    
-    while True:
-        n += 1
-        xn_prev = xn
-        # Ітерація: x = x + tau * f(x) (знак + бо f'<0)
-        xn = xn_prev + tau * f1(xn_prev)
-        diff = abs(xn - xn_prev)
-        
-        print(f"{n:<5} | {xn:<15.10f} | {f1(xn):<15.10f} | {diff:<15.10f}")
-        
-        if diff <= epsilon:
-            break
-        if n > 100:
-            print("Помилка: Перевищено ліміт ітерацій")
-            break
+    # Пункт 4: Таблиця результатів
+    if table:
+        print_iteration_table(f, [float(x) for x in history])
+    if not converged:
+        print("Помилка: Перевищено ліміт ітерацій")
+    return float(root), int(n), bool(converged)
 
 # ==========================================
 # ЗАВДАННЯ 2: Модифікований метод Ньютона
 # ==========================================
 
-def f2(x):
-    return x**3 - 4*x**2 + x + 6
+f2 = Polynomial([1, -4, 1, 6])        # x^3 - 4x^2 + x + 6
+df2 = f2.derivative()                 # 3x^2 - 8x + 1
 
-def df2(x):
-    return 3*x**2 - 8*x + 1
-
-def solve_mod_newton(epsilon):
+def solve_mod_newton(epsilon, f=f2, df=df2, x0=1.5, table=True):
+    """Повертає (корінь, кількість ітерацій, збіжність)."""
     print("\n" + "="*60)
     print("ЗАВДАННЯ 2: Модифікований метод Ньютона")
     print("="*60)
     
-    x0 = 1.5
-    df_x0 = df2(x0) # Похідна фіксована
+    df_x0 = df(x0) # Похідна фіксована
     
     print(f"Початкове наближення x0: {x0}")
     print(f"Фіксована похідна f'(x0): {df_x0:.4f}")
     
+    # Ітерація: x = x - f(x)/f'(x0)
+    root, n, converged, history = mod_newton_many(f, df, x0, epsilon, trace=True)
+    
     # Пункт 4: Таблиця результатів
-    print("\nТаблиця результатів:")
-    print(f"{'n':<5} | {'xn':<15} | {'f(xn)':<15} | {'|xn - xn-1|':<15}")
-    print("-" * 58)
+    if table:
+        print_iteration_table(f, [float(x) for x in history])
+    return float(root), int(n), bool(converged)
+
+def solve_many(epsilon, n_starts, a=-2.0, b=4.0):
+    """
+    Масовий розв'язок рівняння завдання 2 модифікованим методом Ньютона
+    з n_starts початкових наближень на [a, b] - один векторний виклик.
+    """
+    print("\n" + "="*60)
+    print(f"Модифікований метод Ньютона для {n_starts} початкових наближень")
+    print("="*60)
     
-    xn = x0
-    n = 0
-    print(f"{n:<5} | {xn:<15.10f} | {f2(xn):<15.10f} | {'-':<15}")
+    x0 = np.linspace(a, b, n_starts)
+    start = time.perf_counter()
+    roots, iterations, converged = mod_newton_many(f2, df2, x0, epsilon)
+    elapsed = time.perf_counter() - start
     
-    while True:
-        n += 1
-        xn_prev = xn
-        # Ітерація: x = x - f(x)/f'(x0)
-        xn = xn_prev - f2(xn_prev) / df_x0
-        diff = abs(xn - xn_prev)
-        
-        print(f"{n:<5} | {xn:<15.10f} | {f2(xn):<15.10f} | {diff:<15.10f}")
-        
-        if diff <= epsilon:
-            break
-        if n > 100:
-            break
+    print(f"Час: {elapsed:.3f} с, зійшлося: {converged.sum()} з {n_starts}, "
+          f"ітерацій у середньому: {iterations[converged].mean():.1f}")
+    # з точністю eps корені групуються з округленням до 0.01
+    found, counts = np.unique(np.round(roots[converged], 2), return_counts=True)
+    for root, count in zip(found, counts):
+        print(f"  x* = {root:6.2f}: {count} наближень")
+
+def solve_all_roots(epsilon, equations=None):
+    """
+    Усі дійсні корені рівнянь одним викликом find_roots на кожне:
+    відокремлення рядом Штурма і паралельне уточнення (див. roots.py).
+    """
+    print("\n" + "="*60)
+    print("Усі дійсні корені рівнянь")
+    print("="*60)
+    
+    equations = equations or {"Завдання 1": f1, "Завдання 2": f2}
+    for name, f in equations.items():
+        roots, iterations, converged = find_roots(f, epsilon=epsilon)
+        print(f"{name}: {f} = 0")
+        for root, n, ok in zip(roots, iterations, converged):
+            status = "" if ok else " (не зійшлося)"
+            print(f"  x* = {root:.10f}, f(x*) = {f(root):.3e}, ітерацій: {n}{status}")
 
 # ==========================================
 # Головна функція
 # ==========================================
-def main():
-    generate_plots()
+def main(plots="headless", many=None):
+    # Графіки не залежать від розрахунків: з plots="headless" їх малює
+    # окремий процес паралельно з розв'язанням, "none" — без matplotlib
+    worker = None
+    if plots == "headless":
+        worker = multiprocessing.Process(target=generate_plots)
+        worker.start()
     
     # Точність фіксована (згідно з вашим побажанням), 
     # але змінна eps використовується у формулах, 
@@ -159,6 +315,20 @@ def main():
     
     solve_relaxation(eps)
     solve_mod_newton(eps)
+    solve_all_roots(eps)
+    if many:
+        solve_many(eps, many)
+    
+    if worker is not None:
+        worker.join()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Лабораторна 1: розв'язання нелінійних рівнянь")
+    parser.add_argument("--plots", default="headless", choices=["headless", "none"],
+                        help="headless — графіки у фоновому процесі, none — без matplotlib")
+    parser.add_argument("--many", type=int, default=None,
+                        help="розв'язати рівняння завдання 2 для N початкових наближень одночасно")
+    args = parser.parse_args()
+    main(args.plots, args.many)
\ No newline at end of file
@@ -1,5 +1,14 @@
+import time
+
 import numpy as np
 
+from tridiagonal import TridiagonalSolver
+
+try:
+    from scipy.linalg import solve_banded
+except ImportError:
+    solve_banded = None
+
 # ==========================================
 # 1. МЕТОД ГАУССА
 # ==========================================
@@ -69,36 +78,81 @@ def solve_sweep():
     print(f"c: {c}")
     print(f"d: {d}")
 
-    # Прямий хід
-    alpha = np.zeros(n)
-    beta = np.zeros(n)
-
-    # Перший рядок
-    alpha[0] = -c[0] / b[0]
-    beta[0] = d[0] / b[0]
+    # Прямий хід: alpha залежать лише від матриці (див. tridiagonal.py),
+    # beta - від правої частини
+    sweep = TridiagonalSolver(a, b, c)
+    alpha = sweep.alpha
+    beta = sweep.forward(d)
 
     print("\nПрогоночні коефіцієнти:")
     print(f"alpha[1]: {alpha[0]:.4f}, beta[1]: {beta[0]:.4f}")
 
     for i in range(1, n):
-        denom = b[i] + a[i] * alpha[i-1]
-        if i < n - 1:
-            alpha[i] = -c[i] / denom
-        beta[i] = (d[i] - a[i] * beta[i-1]) / denom
         print(f"alpha[{i+1}]: {alpha[i]:.4f} (якщо є), beta[{i+1}]: {beta[i]:.4f}")
 
     # Зворотний хід
-    x = np.zeros(n)
-    x[n-1] = beta[n-1]
-    
-    for i in range(n-2, -1, -1):
-        x[i] = alpha[i] * x[i+1] + beta[i]
+    x = sweep.backward(beta)
 
     print("-" * 30)
     print("Вектор розв'язку X:")
     for i, val in enumerate(x):
         print(f"  x{i+1} = {val:.4f}")
 
+def solve_sweep_batch(n_systems, size, n_rhs=1, seed=0):
+    """
+    Прогонка для пакета n_systems випадкових систем розміру size з діагональною
+    перевагою: одна факторизація, n_rhs правих частин для кожної системи.
+    """
+    print("\n" + "="*50)
+    print(f"Метод прогонки для {n_systems} систем розміру {size} ({n_rhs} правих частин)")
+    print("="*50)
+
+    rng = np.random.default_rng(seed)
+    a, c = rng.uniform(-1.0, 1.0, (2, n_systems, size))
+    b = np.abs(a) + np.abs(c) + rng.uniform(0.5, 1.5, (n_systems, size))
+    d = rng.normal(size=(n_rhs, n_systems, size))
+
+    start = time.perf_counter()
+    sweep = TridiagonalSolver(a, b, c)
+    factor_time = time.perf_counter() - start
+    start = time.perf_counter()
+    x = sweep.solve(d)
+    solve_time = time.perf_counter() - start
+
+    # Нев'язка A x - d
+    r = b * x - d
+    r[..., 1:] += a[..., 1:] * x[..., :-1]
+    r[..., :-1] += c[..., :-1] * x[..., 1:]
+    print(f"Прямий хід (alpha): {factor_time:.3f} с, розв'язок: {solve_time:.3f} с")
+    print(f"Максимальна нев'язка: {np.abs(r).max():.3e}")
+
+def check_sweep_accuracy(size, seed=0):
+    """
+    Точність прогонки на слабко діагонально домінантній матриці
+    (a = c = -1, b = 2, як у неявній схемі для рівняння теплопровідності):
+    похибка відносно відомого розв'язку та, якщо є SciPy,
+    відносно scipy.linalg.solve_banded.
+    """
+    a = np.full(size, -1.0)
+    b = np.full(size, 2.0)
+    c = np.full(size, -1.0)
+    x_true = np.random.default_rng(seed).normal(size=size)
+    d = b * x_true
+    d[1:] += a[1:] * x_true[:-1]
+    d[:-1] += c[:-1] * x_true[1:]
+
+    x = TridiagonalSolver(a, b, c).solve(d)
+    r = b * x - d
+    r[1:] += a[1:] * x[:-1]
+    r[:-1] += c[:-1] * x[1:]
+    print(f"\nМатриця (-1, 2, -1) розміру {size}:")
+    print(f"  похибка |x - x_true|: {np.abs(x - x_true).max():.3e}, нев'язка: {np.abs(r).max():.3e}")
+    if solve_banded is not None:
+        ab = np.vstack([np.r_[0.0, c[:-1]], b, np.r_[a[1:], 0.0]])
+        x_ref = solve_banded((1, 1), ab, d)
+        print(f"  solve_banded: похибка {np.abs(x_ref - x_true).max():.3e}, "
+              f"відмінність від прогонки {np.abs(x - x_ref).max():.3e}")
+
 # ==========================================
 # 3. МЕТОД ЯКОБІ
 # ==========================================
@@ -151,10 +205,21 @@ def solve_jacobi(epsilon=1e-3):
     for i, val in enumerate(x):
         print(f"  x{i+1} = {val:.4f}")
 
-def main():
+def main(batch=None, size=10000, rhs=1):
     solve_gauss()
     solve_sweep()
     solve_jacobi()
+    if batch:
+        solve_sweep_batch(batch, size, rhs)
+        check_sweep_accuracy(size)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Лабораторна 2: розв'язання систем лінійних рівнянь")
+    parser.add_argument("--batch", type=int, default=None,
+                        help="розв'язати прогонкою N випадкових тридіагональних систем одночасно")
+    parser.add_argument("--size", type=int, default=10000, help="розмір кожної системи для --batch")
+    parser.add_argument("--rhs", type=int, default=1, help="кількість правих частин на систему для --batch")
+    args = parser.parse_args()
+    main(args.batch, args.size, args.rhs)
\ No newline at end of file
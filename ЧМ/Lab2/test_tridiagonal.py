@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import tridiagonal
+from tridiagonal import TridiagonalSolver, _linear_recurrence
+
+
+def random_systems(shape, seed=0):
+    """Випадкові системи з діагональною перевагою за рядками."""
+    rng = np.random.default_rng(seed)
+    a, c = rng.uniform(-1.0, 1.0, (2,) + shape)
+    b = np.abs(a) + np.abs(c) + rng.uniform(0.5, 1.5, shape)
+    return a, b, c
+
+
+def dense(a, b, c):
+    return np.diag(b) + np.diag(a[1:], -1) + np.diag(c[:-1], 1)
+
+
+def test_solve_matches_dense():
+    a, b, c = random_systems((3, 200))
+    d = np.random.default_rng(1).normal(size=(2, 3, 200))
+    x = TridiagonalSolver(a, b, c).solve(d)
+    for k in range(3):
+        np.testing.assert_allclose(x[:, k] @ dense(a[k], b[k], c[k]).T, d[:, k], atol=1e-12)
+
+
+def test_lapack_alpha_matches_row_sweep(monkeypatch):
+    pytest.importorskip("scipy")
+    a, b, c = random_systems((4, 500))
+    alpha = TridiagonalSolver(a, b, c).alpha
+    # ширина пакета >= VECTOR_WIDTH - прогонка по рядках
+    monkeypatch.setattr(tridiagonal, "VECTOR_WIDTH", 1)
+    np.testing.assert_allclose(TridiagonalSolver(a, b, c).alpha, alpha, rtol=1e-14, atol=1e-15)
+
+
+def test_poisson_against_solve_banded():
+    solve_banded = pytest.importorskip("scipy.linalg").solve_banded
+    n = 100000
+    a, b, c = -np.ones(n), 2 * np.ones(n), -np.ones(n)
+    d = np.random.default_rng(2).normal(size=n)
+    x = TridiagonalSolver(a, b, c).solve(d)
+    x_ref = solve_banded((1, 1), np.array([c, b, a]), d)
+    assert np.abs(x - x_ref).max() <= 1e-9 * np.abs(x_ref).max()
+
+
+def test_linear_recurrence_with_large_coefficients():
+    # |v| > 1: добутки у блоках переповнюються, а сам y скінченний
+    n = 100000
+    v = np.full(n, 10.0)
+    u = np.zeros(n)
+    u[-1] = 1.0
+    y = _linear_recurrence(v, u)
+    assert np.all(np.isfinite(y))
+    np.testing.assert_array_equal(y[:-1], 0.0)
+    assert y[-1] == 1.0
+
+
+def test_linear_recurrence_matches_loop():
+    rng = np.random.default_rng(3)
+    v, u = rng.uniform(-1.5, 1.5, (2, 2000, 3))
+    expected = u.copy()
+    for i in range(1, len(u)):
+        expected[i] += v[i] * expected[i - 1]
+    np.testing.assert_allclose(_linear_recurrence(v, u), expected, rtol=1e-9, atol=1e-12)
@@ -0,0 +1,188 @@
+import math
+
+import numpy as np
+
+# ==========================================
+# Метод прогонки для пакета тридіагональних систем
+# ==========================================
+# a_i x_{i-1} + b_i x_i + c_i x_{i+1} = d_i,  i = 0..n-1  (a_0 і c_{n-1} не використовуються)
+#
+# Прямий хід:   alpha_i = -c_i / (b_i + a_i alpha_{i-1}),
+#               beta_i  = (d_i - a_i beta_{i-1}) / (b_i + a_i alpha_{i-1})
+# Зворотний хід: x_i = alpha_i x_{i+1} + beta_i
+#
+# alpha залежать лише від матриці, тож рахуються один раз і далі прогонка
+# застосовується до будь-якої кількості правих частин. Для однієї системи
+# чи вузького пакета alpha бере скомпільована LU-факторизація LAPACK ?gttrf
+# (без перестановок рядків це і є прямий хід прогонки), для широкого
+# пакета - звичайна прогонка по рядках, векторно по всьому пакету. Лінійні
+# рекурентності для beta та x (їх рахує кожен solve) - блоками по ~sqrt(n)
+# рядків: ~2 sqrt(n) векторних кроків NumPy замість циклу Python по n.
+
+def _blocks(x, size):
+    """
+    (n, ...) -> (m, size, ...): вісь n ділиться на m блоків по size,
+    останній доповнюється нулями (без доповнення - без копії).
+    """
+    m = -(-len(x) // size)
+    if m * size > len(x):
+        x = np.concatenate([x, np.zeros((m * size - len(x),) + x.shape[1:])])
+    return x.reshape((m, size) + x.shape[1:])
+
+# скільки елементів має обробляти один векторний крок, щоб накладні
+# витрати Python на крок були непомітні
+VECTOR_WIDTH = 512
+
+def _block_size(n, width):
+    """
+    Довжина блоку для n рядків і пакета з width систем: блоків стільки,
+    щоб крок покривав ~VECTOR_WIDTH елементів, але не більше ~sqrt(n).
+    Широкий пакет - один блок, тобто звичайна прогонка по рядках.
+    """
+    blocks = min(-(-VECTOR_WIDTH // max(width, 1)), math.isqrt(n))
+    return -(-n // max(blocks, 1))
+
+def _sequential_recurrence(v, u):
+    """y_i = u_i + v_i * y_{i-1} звичайним циклом по осі 0."""
+    y = u.copy()
+    for i in range(1, len(y)):
+        y[i] += v[i] * y[i - 1]
+    return y
+
+def _linear_recurrence(v, u):
+    """
+    y_0 = u_0, y_i = u_i + v_i * y_{i-1} по осі 0 (v транслюється з u).
+    Вісь ділиться на ~sqrt(n) блоків: спершу рекурентність іде всередині всіх
+    блоків одночасно з нульовим входом (і добуток P множників v від початку
+    блоку), потім вихід кожного блоку передається в наступний:
+    y += P * y_кінець_попереднього. Разом ~2 sqrt(n) векторних кроків.
+    При |v| > 1 добутки P можуть переповнитись (inf * 0 = nan), хоча сам
+    y скінченний - тоді рекурентність рахується послідовно.
+    """
+    u = np.asarray(u, dtype=float)
+    n = len(u)
+    size = _block_size(n, u[0].size)
+    Y = _blocks(u.copy(), size)
+    P = _blocks(np.broadcast_to(v, u.shape).astype(float), size)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for j in range(1, size):
+            Y[:, j] += P[:, j] * Y[:, j - 1]
+            P[:, j] *= P[:, j - 1]
+    if not np.all(np.isfinite(P)):
+        return _sequential_recurrence(np.broadcast_to(v, u.shape), u)
+    for k in range(1, len(Y)):
+        Y[k] += P[k] * Y[k - 1, -1]
+    return Y.reshape((-1,) + u.shape[1:])[:n]
+
+def _lapack_alpha(a, b, c):
+    """
+    alpha через LAPACK dgttrf для кожної системи пакета окремо: без
+    перестановок рядків діагональ U - це d_i = b_i - a_i c_{i-1} / d_{i-1},
+    тобто знаменники прогонки b_i + a_i alpha_{i-1}, і alpha_i = -c_i / d_i.
+    Та сама рекурентність і для транспонованої матриці, тож спершу
+    факторизується вона: при діагональній перевазі за рядками (умова
+    стійкості прогонки) у неї перевага за стовпцями, і часткового вибору
+    головного елемента не буде. None, якщо scipy немає, dgttrf переставляв
+    рядки для обох варіантів або знайшов нульовий елемент - тоді alpha
+    рахує звичайна прогонка (вона ж і повідомляє про нульовий знаменник).
+    """
+    try:
+        from scipy.linalg.lapack import dgttrf
+    except ImportError:
+        return None
+    n = len(b)
+    a, b, c = (x.reshape(n, -1) for x in (a, b, c))
+    alpha = np.zeros_like(b)
+    no_pivoting = np.arange(1, n + 1)
+    for j in range(b.shape[1]):
+        for lower, upper in ((c[:-1, j], a[1:, j]), (a[1:, j], c[:-1, j])):
+            _, d, _, _, ipiv, info = dgttrf(lower, b[:, j], upper)
+            if info == 0 and np.array_equal(ipiv, no_pivoting):
+                break
+        else:
+            return None
+        alpha[:-1, j] = -c[:-1, j] / d[:-1]
+    return alpha
+
+def _sweep_alpha(a, b, c):
+    """
+    alpha_i = -c_i / (b_i + a_i alpha_{i-1}). Рекурентність нелінійна, тож
+    блоки тут не застосовуються (на слабко діагонально домінантних матрицях,
+    як у неявних схемах для рівнянь у частинних похідних, вони втрачають
+    точність). Для пакета вужчого за VECTOR_WIDTH - _lapack_alpha (цикл
+    лише по системах), інакше - прогонка по рядках, векторно по пакету.
+    """
+    if len(b) > 1 and b[0].size < VECTOR_WIDTH:
+        alpha = _lapack_alpha(a, b, c)
+        if alpha is not None:
+            return alpha.reshape(b.shape)
+    alpha = np.empty_like(b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha[0] = -c[0] / b[0]
+        for i in range(1, len(b)):
+            alpha[i] = -c[i] / (b[i] + a[i] * alpha[i - 1])
+    return alpha
+
+def _pad(x, ndim):
+    """(n, *batch) -> (n, 1, ..., 1, *batch) з ndim осями, щоб пакет вирівнявся праворуч."""
+    return x.reshape(x.shape[:1] + (1,) * (ndim - x.ndim) + x.shape[1:])
+
+class TridiagonalSolver:
+    """
+    Прогонка для пакета систем: a, b, c форми (..., n) - піддіагональ,
+    діагональ і наддіагональ (a[..., 0] і c[..., -1] ігноруються).
+    Прогоночні коефіцієнти alpha та 1 / (b_i + a_i alpha_{i-1}) рахуються
+    в конструкторі, solve(d) - прямий і зворотний хід для правих частин
+    d форми (..., n), що транслюється з формою пакета: наприклад, для
+    a, b, c (B, n) і d (K, B, n) - K правих частин для кожної з B систем.
+    alpha, beta = forward(d), backward(beta) і розв'язок - теж форми (..., n).
+    """
+
+    def __init__(self, a, b, c):
+        a, b, c = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (a, b, c)))
+        # вісь n - перша, пакет - наступні осі
+        a, b, c = (np.moveaxis(x, -1, 0).copy() for x in (a, b, c))
+        a[0] = 0.0
+        c[-1] = 0.0
+        self.n = len(b)
+        self._alpha = _sweep_alpha(a, b, c)
+        self._alpha[-1] = 0.0
+
+        denom = b.copy()
+        denom[1:] += a[1:] * self._alpha[:-1]
+        if not np.all(np.isfinite(self._alpha[:-1])) or np.any(denom == 0):
+            raise np.linalg.LinAlgError("Нульовий знаменник прогонки: метод не застосовний")
+        self.inv_denom = 1.0 / denom
+        self.a = a
+
+    @property
+    def alpha(self):
+        return np.moveaxis(self._alpha, 0, -1)
+
+    def _axis_first(self, d):
+        d = np.asarray(d, dtype=float)
+        if d.shape[-1] != self.n:
+            raise ValueError(f"Права частина має мати {self.n} елементів уздовж останньої осі")
+        return np.moveaxis(d, -1, 0)
+
+    def forward(self, d):
+        """Прямий хід: beta форми (..., n)."""
+        d = self._axis_first(d)
+        ndim = max(d.ndim, self.a.ndim)
+        inv_denom = _pad(self.inv_denom, ndim)
+        beta = _linear_recurrence(-_pad(self.a, ndim) * inv_denom, _pad(d, ndim) * inv_denom)
+        return np.moveaxis(beta, 0, -1)
+
+    def backward(self, beta):
+        """Зворотний хід: x_i = beta_i + alpha_i x_{i+1}, від останнього рядка."""
+        beta = self._axis_first(beta)
+        alpha = _pad(self._alpha, beta.ndim)
+        x = _linear_recurrence(alpha[::-1], beta[::-1])[::-1]
+        return np.moveaxis(x, 0, -1)
+
+    def solve(self, d):
+        return self.backward(self.forward(d))
+
+def solve_tridiagonal(a, b, c, d):
+    """Розв'язок пакета тридіагональних систем прогонкою (див. TridiagonalSolver)."""
+    return TridiagonalSolver(a, b, c).solve(d)
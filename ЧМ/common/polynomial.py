@@ -0,0 +1,107 @@
+import numpy as np
+
+# ==========================================
+# Поліноми: схема Горнера
+# ==========================================
+# Коефіцієнти задаються від старшого степеня, як у np.polyval:
+#   [a_n, ..., a_1, a_0]  ->  a_n x^n + ... + a_1 x + a_0
+# Схема Горнера p = (...(a_n x + a_{n-1}) x + ...) x + a_0 не обчислює
+# степенів x: n множень і n додавань, а похідна рахується в тому ж циклі.
+
+def _broadcast(value, x):
+    """Стала value у формі x: масив для масиву, число для числа."""
+    if isinstance(x, (int, float)) or np.ndim(x) == 0 and np.ndim(value) == 0:
+        return value
+    return np.full(np.broadcast_shapes(np.shape(x), np.shape(value)), value, dtype=float)
+
+def horner(x, *coefs):
+    """
+    Значення полінома з коефіцієнтами coefs у точках x. Коефіцієнти можуть
+    бути масивами форми x (свій поліном для кожного елемента), тож функція
+    підходить як f(x, *args) для relaxation_many / mod_newton_many.
+    """
+    p = _broadcast(coefs[0], x)
+    for c in coefs[1:]:
+        p = p * x + c
+    return p
+
+def horner_with_derivative(x, *coefs):
+    """Значення p(x) та похідна p'(x) за один прохід."""
+    p, d = _broadcast(coefs[0], x), _broadcast(0.0, x)
+    for c in coefs[1:]:
+        d = d * x + p
+        p = p * x + c
+    return p, d
+
+def interval_horner(lo, hi, *coefs):
+    """
+    Схема Горнера в інтервальній арифметиці: для відрізків [lo, hi]
+    (масиви однакової форми) повертає (p_lo, p_hi) - межі, що гарантовано
+    містять усі значення полінома на кожному відрізку. Межі трохи завищені,
+    тому відрізки варто брати короткими. Округлення - назовні: і добуток,
+    і сума зсуваються на одну одиницю останнього розряду (похибка кожної
+    операції з округленням до найближчого - не більше половини).
+    """
+    down, up = -np.inf, np.inf
+    p_lo = p_hi = np.full(np.shape(lo), float(coefs[0]))
+    for c in coefs[1:]:
+        products = (p_lo * lo, p_lo * hi, p_hi * lo, p_hi * hi)
+        low = np.nextafter(np.minimum.reduce(products), down)
+        high = np.nextafter(np.maximum.reduce(products), up)
+        p_lo = np.nextafter(low + c, down)
+        p_hi = np.nextafter(high + c, up)
+    return p_lo, p_hi
+
+class Polynomial:
+    """
+    Поліном з масиву коефіцієнтів (від старшого степеня).
+    p(x) - значення, p.value_and_derivative(x) - (p(x), p'(x)),
+    p.derivative() - поліном-похідна, p.enclose(a, b) - межі значень
+    на відрізку. x - число або масив NumPy.
+    """
+
+    def __init__(self, coefs):
+        coefs = np.trim_zeros(np.atleast_1d(np.asarray(coefs, dtype=float)), "f")
+        self.coefs = coefs if coefs.size else np.zeros(1)
+        # числа Python: для скалярного x обчислення без скалярів NumPy
+        self._coefs = [float(c) for c in self.coefs]
+        self._derivative = None
+
+    @property
+    def degree(self):
+        return self.coefs.size - 1
+
+    def __call__(self, x):
+        return horner(x, *self._coefs)
+
+    def value_and_derivative(self, x):
+        return horner_with_derivative(x, *self._coefs)
+
+    def enclose(self, a, b, pieces=1000):
+        """
+        Гарантовані межі значень на [a, b]: відрізок ділиться на pieces
+        частин, на кожній - interval_horner. Повертає (p_lo, p_hi) по частинах.
+        """
+        edges = np.linspace(a, b, pieces + 1)
+        return interval_horner(edges[:-1], edges[1:], *self.coefs)
+
+    def derivative(self):
+        if self._derivative is None:
+            powers = np.arange(self.degree, 0, -1)
+            self._derivative = Polynomial(self.coefs[:-1] * powers)
+        return self._derivative
+
+    def __repr__(self):
+        terms = []
+        for power, c in zip(range(self.degree, -1, -1), self.coefs):
+            if c == 0:
+                continue
+            sign = "-" if c < 0 else "+"
+            mag = abs(c)
+            coef = "" if mag == 1 and power else f"{mag:g}"
+            var = "" if power == 0 else ("x" if power == 1 else f"x^{power}")
+            terms.append(f"{sign} {coef}{var}")
+        if not terms:
+            return "0"
+        text = " ".join(terms)
+        return text[2:] if text.startswith("+ ") else "-" + text[2:]
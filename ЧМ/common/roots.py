@@ -0,0 +1,233 @@
+import numpy as np
+
+from polynomial import Polynomial
+
+# ==========================================
+# Відокремлення та уточнення всіх дійсних коренів полінома
+# ==========================================
+# 1. Ряд Штурма p0, p1 = p0', p_{k+1} = -rem(p_{k-1}, p_k) для полінома без
+#    кратних коренів p0 = p / НСД(p, p'): кількість різних дійсних коренів
+#    на (a, b] дорівнює V(a) - V(b), V - кількість змін знаку в ряді.
+# 2. V рахується одразу на сітці точок; відрізки сітки з кількома коренями
+#    діляться навпіл - усі одночасно, поки в кожному не лишиться один корінь.
+#    Відрізки, які вже не вдається поділити, повертаються з позначкою.
+# 3. Усі відрізки уточнюються паралельно гібридом Ньютона та бісекції.
+
+def _trim(coefs, tol):
+    """
+    Відкидає старші коефіцієнти, що є нулями з точністю до округлення
+    (tol - число або масив порогів для кожного коефіцієнта).
+    """
+    coefs = np.asarray(coefs, dtype=float)
+    nonzero = np.nonzero(np.abs(coefs) > tol)[0]
+    return coefs[nonzero[0]:] if nonzero.size else np.zeros(1)
+
+def _divide(u, v, scale=False):
+    """
+    Ділення поліномів u / v кутом: (частка, остача). На відміну від
+    np.polydiv, малі старші коефіцієнти остачі не відкидаються.
+    scale=True - ще й масштаб кожного коефіцієнта остачі: сума модулів
+    доданків, з яких він утворився (|u_i| та всіх |q_k v_j|), тобто
+    величина, відносно якої остача може бути шумом округлення.
+    """
+    u = np.array(u, dtype=float)
+    size = np.abs(u)
+    steps = len(u) - len(v) + 1
+    if steps <= 0:
+        quotient = np.zeros(1)
+    else:
+        quotient = np.empty(steps)
+        for k in range(steps):
+            quotient[k] = u[k] / v[0]
+            u[k:k + len(v)] -= quotient[k] * v
+            size[k:k + len(v)] += np.abs(quotient[k] * v)
+        u, size = (u[steps:], size[steps:]) if len(v) > 1 else (np.zeros(1), np.zeros(1))
+    return (quotient, u, size) if scale else (quotient, u)
+
+def _remainder(u, v, rtol):
+    """
+    Остача u / v, у якій нулями вважаються коефіцієнти, не більші за rtol
+    від свого масштабу (див. _divide): поріг відносний для кожного
+    коефіцієнта, тож не залежить від масштабу x і величини коренів.
+    """
+    _, r, size = _divide(u, v, scale=True)
+    return _trim(r, rtol * size)
+
+def _is_zero(coefs):
+    return coefs.size == 1 and coefs[0] == 0
+
+def squarefree(p, rtol=1e-10):
+    """
+    p / НСД(p, p') - ті самі корені, але всі прості. НСД шукається
+    алгоритмом Евкліда з відкиданням коефіцієнтів остач, менших за rtol
+    відносно доданків, з яких вони утворились (див. _remainder):
+    близькі корені (|x1 - x2| менше ~sqrt(rtol) |x|, для rtol = 1e-10 -
+    відносно ~1e-5) вважаються кратним коренем і зливаються.
+    """
+    u, v = p.coefs, p.derivative().coefs
+    while not _is_zero(v):
+        u, v = v, _remainder(u, v, rtol)
+    if u.size == 1:
+        return p
+    return Polynomial(_divide(p.coefs, u)[0])
+
+def sturm_sequence(p, rtol=1e-10):
+    """
+    Ряд Штурма для squarefree(p) - список Polynomial. Члени ряду
+    нормуються на найбільший коефіцієнт (додатний множник не змінює
+    знаків). Коефіцієнти остач мають великий розкид (для полінома
+    Уілкінсона - на десятки порядків), тож відкидаються лише точні нулі.
+    """
+    p0 = squarefree(p, rtol)
+    seq = [p0.coefs, p0.derivative().coefs]
+    seq = [c / np.abs(c).max() for c in seq]
+    while seq[-1].size > 1:
+        r = -_remainder(seq[-2], seq[-1], 0.0)
+        if _is_zero(r):
+            break
+        seq.append(r / np.abs(r).max())
+    return [Polynomial(c) for c in seq]
+
+def sign_changes(seq, x):
+    """
+    V(x) для масиву точок x. Нуль у ряді замінюється знаком наступного
+    члена: для проміжних членів це не змінює V, а в корені p0 дає V(x+0),
+    тож V(a) - V(b) рахує корені на (a, b].
+    """
+    signs = np.sign([np.broadcast_to(q(x), np.shape(x)) for q in seq])
+    for i in range(len(seq) - 2, -1, -1):
+        signs[i] = np.where(signs[i] == 0, signs[i + 1], signs[i])
+    return np.sum(signs[:-1] != signs[1:], axis=0)
+
+def root_bound(p):
+    """
+    Межа Фудзівари: усі корені p лежать у
+    |x| <= 2 max(|a_{n-1}/a_n|, |a_{n-2}/a_n|^(1/2), ..., |a_0 / (2 a_n)|^(1/n)).
+    """
+    if p.degree == 0:
+        return 0.0
+    ratios = np.abs(p.coefs[1:] / p.coefs[0])
+    ratios[-1] /= 2
+    return 2 * np.max(ratios ** (1.0 / np.arange(1, p.degree + 1)))
+
+def isolate_roots(p, a=None, b=None, n=100, max_depth=200):
+    """
+    Відрізки (lo, hi), на кожному рівно один різний корінь p з (a, b]
+    (за замовчуванням - межа Фудзівари). Спочатку сітка з n відрізків,
+    далі відрізки з кількома коренями діляться навпіл усі разом, доки
+    середина відрізку відрізняється від кінців (або max_depth поділів).
+    Повертає (seq, lo, hi, count), seq - ряд Штурма, count - кількість
+    коренів на відрізку: count > 1 - корені не вдалося відокремити.
+    """
+    if a is None or b is None:
+        # + 1: корінь на самій межі не має випасти з (a, b]
+        bound = root_bound(p) + 1
+        a = -bound if a is None else a
+        b = bound if b is None else b
+    seq = sturm_sequence(p)
+    edges = np.linspace(a, b, n + 1)
+    V = sign_changes(seq, edges)
+    lo, hi = edges[:-1], edges[1:]
+    V_lo, V_hi = V[:-1], V[1:]
+
+    done_lo, done_hi, done_count = [], [], []
+    for depth in range(max_depth + 1):
+        count = V_lo - V_hi
+        mid = 0.5 * (lo + hi)
+        # більше не ділиться: один корінь, ліміт поділів або межа точності
+        stuck = (mid <= lo) | (mid >= hi) | (depth == max_depth)
+        done = (count == 1) | ((count > 1) & stuck)
+        done_lo.append(lo[done])
+        done_hi.append(hi[done])
+        done_count.append(count[done])
+        many = (count > 1) & ~stuck
+        if not many.any():
+            break
+        lo, hi, mid, V_lo, V_hi = lo[many], hi[many], mid[many], V_lo[many], V_hi[many]
+        V_mid = sign_changes(seq, mid)
+        lo, hi = np.concatenate([lo, mid]), np.concatenate([mid, hi])
+        V_lo, V_hi = np.concatenate([V_lo, V_mid]), np.concatenate([V_mid, V_hi])
+
+    lo, hi, count = (np.concatenate(x) for x in (done_lo, done_hi, done_count))
+    order = np.argsort(lo)
+    return seq, lo[order], hi[order], count[order]
+
+def refine_brackets(p, lo, hi, epsilon, max_iter=100):
+    """
+    Уточнення коренів p на відрізках [lo, hi] зі зміною знаку - всі відрізки
+    одночасно. Крок Ньютона з поточного x (p і p' - одним проходом Горнера),
+    якщо він лишається у відрізку і зменшує крок хоча б удвічі,
+    інакше - бісекція. Відрізок звужується за знаком p(x).
+    Зупинка, коли крок <= epsilon. Повертає (roots, iterations, converged).
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    x = 0.5 * (lo + hi)
+    dx_old = hi - lo
+    # корінь на правому кінці - вже знайдений; на лівому кінці його бути
+    # не може (відрізки напіввідкриті), тоді знак ліворуч протилежний p(hi)
+    s_lo, s_hi = np.sign(p(lo)), np.sign(p(hi))
+    p_lo = np.where(s_lo != 0, s_lo, -s_hi)
+    x[s_hi == 0] = hi[s_hi == 0]
+    iterations = np.zeros(x.size, dtype=int)
+    converged = s_hi == 0
+    active = np.flatnonzero(~converged)
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for n in range(1, max_iter + 1):
+            if active.size == 0:
+                break
+            xa, la, ha = x[active], lo[active], hi[active]
+            value, slope = p.value_and_derivative(xa)
+
+            # звуження відрізка
+            left = np.sign(value) == p_lo[active]
+            la = np.where(left, xa, la)
+            ha = np.where(left, ha, xa)
+
+            step = value / slope
+            x_new = xa - step
+            newton = (np.isfinite(x_new) & (x_new > la) & (x_new < ha)
+                      & (np.abs(2 * step) <= np.abs(dx_old[active])))
+            x_new = np.where(newton, x_new, 0.5 * (la + ha))
+            x_new = np.where(value == 0, xa, x_new)
+            dx = np.abs(x_new - xa)
+
+            x[active], lo[active], hi[active] = x_new, la, ha
+            dx_old[active] = dx
+            iterations[active] = n
+
+            done = (dx <= epsilon) | (value == 0)
+            converged[active[done]] = True
+            active = active[~done]
+
+    return x, iterations, converged
+
+def verify_roots(p, x, epsilon=1e-10):
+    """
+    Перевірка наближень x до коренів самого p (а не squarefree(p)): p змінює
+    знак на [x - h, x + h], h = max(epsilon, кілька ulp x), або |p(x)| не
+    більше за оцінку похибки округлення схеми Горнера (кратний корінь).
+    """
+    x = np.asarray(x, dtype=float)
+    h = np.maximum(epsilon, 4 * np.spacing(np.abs(x)))
+    sign_change = np.sign(p(x - h)) * np.sign(p(x + h)) <= 0
+    bound = 2 * p.degree * np.finfo(float).eps * Polynomial(np.abs(p.coefs))(np.abs(x))
+    return sign_change | (np.abs(p(x)) <= bound)
+
+def find_roots(p, a=None, b=None, epsilon=1e-10):
+    """
+    Усі різні дійсні корені полінома p на (a, b] одним викликом
+    (за замовчуванням - усі дійсні корені). Повертає (roots, iterations, converged),
+    корені впорядковані за зростанням. Для відрізка, на якому корені
+    не вдалося відокремити, повертається один корінь з converged = False;
+    так само для наближення, яке не проходить verify_roots (напр., два
+    близькі корені, злиті в squarefree).
+    """
+    if p.degree == 0:
+        if p.coefs[0] == 0:
+            raise ValueError("Нульовий поліном: коренем є будь-яке x")
+        return np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=bool)
+    _, lo, hi, count = isolate_roots(p, a, b)
+    roots, iterations, converged = refine_brackets(squarefree(p), lo, hi, epsilon)
+    return roots, iterations, converged & (count == 1) & verify_roots(p, roots, epsilon)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from polynomial import Polynomial
+from roots import find_roots, squarefree
+
+
+@pytest.mark.parametrize("expected", [
+    [0.0, 1e-5],
+    [1e-5, 3e-5],
+    [1e-8, 2e-8],
+    [1e-3, 2e-3, 1e5],
+])
+def test_close_roots_near_zero_are_separated(expected):
+    roots, _, converged = find_roots(Polynomial(np.poly(expected)))
+    assert converged.all()
+    np.testing.assert_allclose(roots, expected, rtol=1e-6, atol=1e-12)
+
+
+def test_multiple_roots_are_merged():
+    p = Polynomial(np.poly([2, 2, 2, 5]))
+    assert squarefree(p).degree == 2
+    roots, _, converged = find_roots(p)
+    assert converged.all()
+    np.testing.assert_allclose(roots, [2, 5])
+
+
+def test_merged_distinct_roots_are_not_reported_as_converged():
+    # корені ближче за sqrt(rtol) |x| зливаються в squarefree, але
+    # середина між ними не є коренем p
+    roots, _, converged = find_roots(Polynomial(np.poly([1, 1 + 1e-6])))
+    assert roots.size == 1
+    assert not converged.any()
+
+
+def test_wilkinson():
+    roots, _, converged = find_roots(Polynomial(np.poly(np.arange(1, 16))))
+    assert converged.all()
+    np.testing.assert_allclose(roots, np.arange(1, 16), rtol=1e-6)